@@ -0,0 +1,154 @@
+"""
+Scaling benchmark for the converter on synthetic Teams transcripts.
+
+For each size a synthetic VTT file is generated once, then the pipeline is
+timed stage by stage (best of ``--repeat`` runs):
+
+- ``parse``:  iterating ``iter_cues`` over the file
+- ``scan``:   the header pre-scan (cue count, participants, duration),
+  which parses the file a second time in a full conversion
+- ``merge``:  ``merge_turns`` on top of parsing, minus the parse time
+- ``render``: formatting an already merged list of turns as Markdown
+
+``total`` is the full streaming conversion, which runs all four stages.
+With ``--workers N`` the full conversion is also timed with the segmented
+parallel merge (``parallel_s``). Peak traced Python allocations of a full
+conversion are measured in a separate run with ``tracemalloc``. Results are
+written as JSON so runs on different commits can be compared.
+
+    python benchmarks/bench_converter.py --cues 1000 100000 1000000 -o bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic import write_synthetic_vtt
+from vtt2md.converter import VttConverter, _render_turn, iter_cues, merge_turns
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+class _NullWriter:
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _best_time(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _consume(iterator) -> int:
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _render(converter: VttConverter, turns: list, out) -> None:
+    out.write(converter._render_header(turns[0].start_ms, turns[-1].end_ms, []))
+    for turn in turns:
+        out.write(_render_turn(turn.speaker, turn.start_ms, turn.text))
+
+
+def bench_size(vtt_path: Path, cue_count: int, repeat: int, measure_memory: bool, workers: int = 1) -> dict:
+    parsed = _consume(iter_cues(vtt_path))
+    if parsed != cue_count:
+        raise RuntimeError(f"generator wrote {cue_count} cues but {parsed} were parsed")
+
+    parse_s = _best_time(lambda: _consume(iter_cues(vtt_path)), repeat)
+    scan_s = _best_time(lambda: VttConverter(vtt_path, str(vtt_path)).prescan(iter_cues(vtt_path)), repeat)
+    parse_merge_s = _best_time(lambda: _consume(merge_turns(iter_cues(vtt_path))), repeat)
+    turns = list(merge_turns(iter_cues(vtt_path)))
+    converter = VttConverter(vtt_path, str(vtt_path), meeting_datetime="2025-01-01 00:00")
+    render_s = _best_time(lambda: _render(converter, turns, _NullWriter()), repeat)
+    full_s = _best_time(lambda: VttConverter(vtt_path, str(vtt_path)).write_markdown(_NullWriter()), repeat)
+
+    result = {
+        'cues': cue_count,
+        'turns': len(turns),
+        'input_bytes': vtt_path.stat().st_size,
+        'parse_s': parse_s,
+        'scan_s': scan_s,
+        'merge_s': max(parse_merge_s - parse_s, 0.0),
+        'render_s': render_s,
+        'total_s': full_s,
+        'cues_per_s': cue_count / full_s,
+        'parallel_s': None,
+        'peak_alloc_bytes': None,
+    }
+    if workers > 1:
+        result['parallel_s'] = _best_time(
+            lambda: VttConverter(vtt_path, str(vtt_path), workers=workers).write_markdown(_NullWriter()), repeat)
+    if measure_memory:
+        tracemalloc.start()
+        VttConverter(vtt_path, str(vtt_path)).write_markdown(_NullWriter())
+        result['peak_alloc_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the VTT converter on synthetic transcripts.")
+    parser.add_argument('--cues', type=int, nargs='+', default=list(DEFAULT_SIZES), help="transcript sizes")
+    parser.add_argument('--speakers', type=int, default=6)
+    parser.add_argument('--mean-turn-length', type=float, default=4.0)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage; the best is reported")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="also time the segmented parallel merge with this many processes")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory run")
+    parser.add_argument('-o', '--output', type=Path, help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'speakers': args.speakers,
+        'mean_turn_length': args.mean_turn_length,
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for cue_count in args.cues:
+            vtt_path = Path(tmp) / f"synthetic_{cue_count}.vtt"
+            with open(vtt_path, 'w', encoding='utf-8') as out:
+                write_synthetic_vtt(out, cue_count, args.speakers, args.mean_turn_length)
+            result = bench_size(vtt_path, cue_count, args.repeat, not args.no_memory, args.workers)
+            report['results'].append(result)
+            peak = result['peak_alloc_bytes']
+            print(f"{cue_count:>9} cues: parse {result['parse_s']:.3f}s  scan {result['scan_s']:.3f}s  "
+                  f"merge {result['merge_s']:.3f}s  render {result['render_s']:.3f}s  "
+                  f"total {result['total_s']:.3f}s  ({result['cues_per_s']:.0f} cues/s"
+                  + (f", parallel {result['parallel_s']:.3f}s" if result['parallel_s'] is not None else "")
+                  + (f", peak {peak / 1e6:.1f} MB)" if peak is not None else ")"))
+            vtt_path.unlink()
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Import-time budget for the entry points, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter ``--repeat`` times and the
+best cumulative import time is kept. ``--check`` compares against the
+checked-in baseline (``importtime_baseline.json``) and fails when a module
+exceeds its budget or when a headless entry point pulls in Tk.
+
+Absolute times depend on the machine, so every module is measured
+alternately with a stdlib reference import (:data:`REFERENCE_MODULE`) and
+the baseline stores import times relative to it. Measuring ``vtt2md.main``
+needs the GUI dependencies (``requirements.txt``) on ``PYTHONPATH``.
+
+    python benchmarks/bench_import.py --check
+    python benchmarks/bench_import.py --write-baseline   # after an intended change
+"""
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+BASELINE_PATH = Path(__file__).with_name('importtime_baseline.json')
+# Entry points that must start without Tk and the modules measured for each
+HEADLESS_MODULES = ('vtt2md.cli', 'vtt2md.converter', 'vtt2md.aio')
+GUI_MODULES = ('vtt2md.main',)
+TK_MODULES = ('tkinter', '_tkinter', 'customtkinter', 'tkinterdnd2', 'tkcalendar')
+# Stdlib yardstick for the speed of the machine, of the same order as the entry points
+REFERENCE_MODULE = 'asyncio'
+# Budget = relative baseline * tolerance; import times are noisy across runs
+DEFAULT_TOLERANCE = 1.5
+
+
+def measure(module: str) -> tuple[int, list[str]]:
+    """Cumulative import time of ``module`` in microseconds, and every module it imported."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True, env=env, check=True)
+    cumulative = None
+    imported = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        imported.append(name.strip())
+        if name.strip() == module:
+            cumulative = int(cumulative_us)
+    return cumulative, imported
+
+
+def best_of(module: str, repeat: int) -> tuple[int, list[str], int]:
+    """
+    Best import time of ``module`` (with what it imported) and best time of
+    the reference, measured alternately so a change in machine load hits both.
+    """
+    runs = []
+    reference_runs = []
+    for _ in range(repeat):
+        reference_runs.append(measure(REFERENCE_MODULE)[0])
+        runs.append(measure(module))
+    cumulative, imported = min(runs, key=lambda run: run[0])
+    return cumulative, imported, min(reference_runs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import times of the vtt2md entry points.")
+    parser.add_argument('--repeat', type=int, default=10, help="fresh interpreters per module; the best is kept")
+    parser.add_argument('--check', action='store_true', help="fail when a module exceeds its budget")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--write-baseline', action='store_true', help=f"write {BASELINE_PATH.name}")
+    args = parser.parse_args(argv)
+
+    # Measure with up-to-date bytecode, as in the frozen executable
+    compileall.compile_dir(SRC, quiet=1)
+    baseline = json.loads(BASELINE_PATH.read_text(encoding='utf-8')) if BASELINE_PATH.exists() else {}
+    if baseline.get('reference') != REFERENCE_MODULE:
+        baseline = {}
+    relative_baseline = baseline.get('relative', {})
+    results = {}
+    failures = []
+    for module in HEADLESS_MODULES + GUI_MODULES:
+        try:
+            cumulative, imported, reference = best_of(module, args.repeat)
+        except subprocess.CalledProcessError as e:
+            # The GUI dependencies are not installed everywhere
+            print(f"{module:>18}: cannot be imported here ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        relative = cumulative / reference
+        results[module] = round(relative, 3)
+        line = f"{module:>18}: {cumulative / 1000:7.1f} ms = {relative:.2f} x {REFERENCE_MODULE}"
+        budget = relative_baseline.get(module)
+        if budget:
+            line += f"  (baseline {budget:.2f})"
+            if args.check and relative > budget * args.tolerance:
+                failures.append(f"{module} took {relative:.2f} x {REFERENCE_MODULE}, "
+                                f"budget {budget * args.tolerance:.2f}")
+        elif args.check:
+            failures.append(f"{module} has no baseline; run with --write-baseline")
+        print(line)
+        tk = sorted(set(imported) & set(TK_MODULES))
+        if module in HEADLESS_MODULES and tk:
+            failures.append(f"{module} imports {', '.join(tk)}")
+
+    if args.write_baseline:
+        # Modules not measured this time (e.g. no GUI dependencies) keep their baseline
+        baseline = {'reference': REFERENCE_MODULE, 'relative': {**relative_baseline, **results}}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + '\n', encoding='utf-8')
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Per-cue timestamp cost: the old ``datetime.strptime`` handling versus the
+integer-millisecond parser used by the converter.
+
+    python benchmarks/bench_timestamps.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from vtt2md.converter import _parse_timestamp_ms
+
+START = "01:23:45.678"
+END = "01:23:47.012"
+NUMBER = 200_000
+
+
+def strptime_per_cue():
+    # What _merge_captions used to do for each cue: parse the cue start and the previous end
+    start = datetime.strptime(START.split('.')[0], '%H:%M:%S')
+    end = datetime.strptime(END.split('.')[0], '%H:%M:%S')
+    return (start - end).total_seconds() <= 60
+
+
+def millis_per_cue():
+    return _parse_timestamp_ms(START) - _parse_timestamp_ms(END) <= 60000
+
+
+if __name__ == "__main__":
+    for name, func in (("strptime", strptime_per_cue), ("int ms", millis_per_cue)):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:>10}: {seconds / NUMBER * 1e9:8.0f} ns/cue")
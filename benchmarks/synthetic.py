@@ -0,0 +1,86 @@
+"""
+Synthetic MS Teams-style VTT generator for benchmarks.
+
+Cues carry "<uuid>/<n>-<m>" identifiers and "<v Speaker>" voice tags like a
+Teams export. Speakers talk in turns whose length (in cues) follows a
+geometric distribution with the given mean, so long monologues and quick
+back-and-forth both occur.
+
+    python benchmarks/synthetic.py 100000 -o big.vtt --speakers 8
+"""
+import argparse
+import random
+import sys
+import uuid
+
+SENTENCES = (
+    "資料の構成について確認させてください。",
+    "前回の打ち合わせで出た課題を整理しました。",
+    "納期は来月末で問題ないと思います。",
+    "図面の修正版を今日中に共有します。",
+    "うん。",
+    "はい、お願いします。",
+    "えー、それについては持ち帰って検討します。",
+    "Let's go through the open action items first.",
+    "I think the second option is more realistic.",
+    "Yeah.",
+    "Could you share your screen for a moment?",
+)
+
+
+def _timestamp(ms: int) -> str:
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+def write_synthetic_vtt(out, cue_count: int, speaker_count: int = 6, mean_turn_length: float = 4.0,
+                        seed: int = 0) -> None:
+    """Write a Teams-style VTT with ``cue_count`` cues to the text file ``out``."""
+    rng = random.Random(seed)
+    speakers = [f"Speaker {i + 1} (話者 {i + 1})" for i in range(speaker_count)]
+    session = uuid.UUID(int=rng.getrandbits(128))
+    out.write("WEBVTT\n")
+
+    position_ms = 0
+    speaker = speakers[0]
+    remaining_in_turn = 0
+    for index in range(cue_count):
+        if remaining_in_turn <= 0:
+            speaker = rng.choice(speakers)
+            # Geometric turn length with the requested mean
+            remaining_in_turn = 1
+            while rng.random() > 1 / mean_turn_length:
+                remaining_in_turn += 1
+        remaining_in_turn -= 1
+
+        start_ms = position_ms + rng.randrange(0, 1500)
+        end_ms = start_ms + rng.randrange(500, 8000)
+        position_ms = end_ms
+        lines = rng.choice(SENTENCES)
+        if rng.random() < 0.15:
+            lines += "\n" + rng.choice(SENTENCES)
+        out.write(f"\n{session}/{index}-0\n{_timestamp(start_ms)} --> {_timestamp(end_ms)}\n"
+                  f"<v {speaker}>{lines}</v>\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Teams-style VTT file.")
+    parser.add_argument('cues', type=int, help="number of cues")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--speakers', type=int, default=6)
+    parser.add_argument('--mean-turn-length', type=float, default=4.0, help="mean cues per speaker turn")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            write_synthetic_vtt(out, args.cues, args.speakers, args.mean_turn_length, args.seed)
+    else:
+        write_synthetic_vtt(sys.stdout, args.cues, args.speakers, args.mean_turn_length, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
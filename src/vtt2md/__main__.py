@@ -0,0 +1,6 @@
+import sys
+
+from vtt2md.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Asyncio API for embedding the converter in async services.
+
+    async for chunk in aconvert(request.content, "meeting.vtt"):
+        await response.write(chunk.encode('utf-8'))
+
+The upload is spooled as it arrives (in memory, then on disk past
+``spool_max_size``) without touching the CPU-heavy code on the event loop.
+Meanwhile an executor thread parses the arriving bytes for the header
+(cue count, participants, duration), so the header is ready as soon as the
+upload is complete. The turns are then merged from the spool on the
+executor in batches of roughly ``batch_chars`` characters and every chunk
+is handed back as soon as its batch is done, so the event loop keeps
+serving other requests and the response starts before the whole
+transcript is rendered.
+"""
+import asyncio
+import queue
+import tempfile
+import threading
+from datetime import datetime
+
+from vtt2md.converter import MEETING_DATETIME_FORMAT, VttConverter, iter_cues
+
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+DEFAULT_BATCH_CHARS = 64 * 1024
+_READ_SIZE = 64 * 1024
+
+
+async def _iter_stream(stream):
+    # aiohttp's StreamReader and asyncio.StreamReader expose read(n); anything else must be an async iterable
+    if hasattr(stream, 'read'):
+        while True:
+            data = await stream.read(_READ_SIZE)
+            if not data:
+                return
+            yield data
+    else:
+        async for data in stream:
+            yield data
+
+
+class _UploadReader:
+    """Binary file object over the chunks handed over by the event loop; ``b''`` ends the upload."""
+
+    def __init__(self):
+        self.chunks = queue.SimpleQueue()
+
+    def read(self, n: int = -1) -> bytes:
+        # read(0) is the parser's end-of-file probe
+        return self.chunks.get() if n else b''
+
+
+def _next_batch(chunks, batch_chars: int) -> list[str]:
+    batch = []
+    size = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= batch_chars:
+            break
+    return batch
+
+
+async def aconvert(stream, file_path: str, meeting_datetime: str | None = None, remove_fillers: bool = False,
+                   speaker_stats: bool = False, executor=None, spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+                   batch_chars: int = DEFAULT_BATCH_CHARS):
+    """
+    Convert the VTT bytes of the async ``stream`` and yield Markdown chunks.
+
+    ``stream`` is an object with an ``async read(n)`` method (aiohttp or
+    asyncio stream readers) or an async iterable of ``bytes``; the encoding
+    is detected as for files. ``file_path`` only gives the document title;
+    without ``meeting_datetime`` the time of the upload is used. CPU work
+    runs on ``executor`` (the loop's default executor when ``None``), which
+    must be a thread pool; the header pre-scan holds one of its threads for
+    the duration of the upload. Errors are raised as in
+    :func:`~vtt2md.converter.stream_vtt_to_md`; an upload the pre-scan
+    rejects (e.g. without a WEBVTT header) is not read any further.
+    """
+    loop = asyncio.get_running_loop()
+    if meeting_datetime is None:
+        meeting_datetime = datetime.now().strftime(MEETING_DATETIME_FORMAT)
+    with tempfile.SpooledTemporaryFile(max_size=spool_max_size) as spool:
+        cancel_event = threading.Event()
+        converter = VttConverter(spool, file_path, meeting_datetime=meeting_datetime,
+                                 remove_fillers=remove_fillers, speaker_stats=speaker_stats,
+                                 cancel_event=cancel_event)
+        upload = _UploadReader()
+        scan = loop.run_in_executor(executor, converter.prescan, iter_cues(upload))
+        try:
+            async for data in _iter_stream(stream):
+                if scan.done():
+                    break  # the pre-scan failed; its error is raised below
+                spool.write(data)
+                if data:
+                    upload.chunks.put(data)
+        finally:
+            upload.chunks.put(b'')
+        await scan
+
+        chunks = converter.iter_markdown()
+        try:
+            while True:
+                batch = await loop.run_in_executor(executor, _next_batch, chunks, batch_chars)
+                if not batch:
+                    return
+                for chunk in batch:
+                    yield chunk
+        finally:
+            # A batch may still be running on the executor if the consumer gave up early
+            cancel_event.set()
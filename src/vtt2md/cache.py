@@ -0,0 +1,171 @@
+"""
+On-disk conversion cache used by the batch CLI.
+
+A SQLite database next to the output (``.vtt2md-cache.sqlite``) stores
+zlib-compressed Markdown keyed by a SHA-256 of the VTT bytes plus every
+option that changes the output. A second table remembers which key produced
+each output file together with the input's size and mtime, so unchanged
+inputs whose output is still in place are skipped without even hashing.
+Entries are evicted least-recently-used once the stored size exceeds
+``max_bytes``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+CACHE_FILENAME = '.vtt2md-cache.sqlite'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Bump whenever the rendered Markdown changes so stale entries are not served
+CACHE_SCHEMA_VERSION = 1
+_IO_CHUNK_SIZE = 1024 * 1024
+_PART_SEPARATOR = b'\0'
+
+
+def options_key(options: dict) -> str:
+    """Stable string for the conversion options that affect the output."""
+    return json.dumps({'version': CACHE_SCHEMA_VERSION, **options}, sort_keys=True, ensure_ascii=False)
+
+
+def content_key(vtt_path: Path, opts_key: str) -> str:
+    digest = hashlib.sha256(opts_key.encode('utf-8'))
+    digest.update(b'\0')
+    with open(vtt_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_IO_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _open_output(md_path: Path):
+    md_path.parent.mkdir(parents=True, exist_ok=True)
+    return open(md_path, 'wb')
+
+
+def default_cache_path(md_path: Path) -> Path:
+    return md_path.parent / CACHE_FILENAME
+
+
+def file_date_option(vtt_path: Path) -> str:
+    # Without an explicit meeting datetime the header shows the file modification date
+    return time.strftime('%Y-%m-%d', time.localtime(os.path.getmtime(vtt_path)))
+
+
+class ConversionCache:
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Several worker processes share one database; wait for locks instead of failing
+        self._db = sqlite3.connect(self.path, timeout=60)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS outputs (
+                output TEXT PRIMARY KEY,
+                input TEXT NOT NULL,
+                input_size INTEGER NOT NULL,
+                input_mtime_ns INTEGER NOT NULL,
+                options TEXT NOT NULL,
+                key TEXT NOT NULL
+            );
+        ''')
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_up_to_date(self, vtt_path: Path, md_path: Path, opts_key: str) -> bool:
+        """
+        True if ``md_path`` (an output file, or the folder of a split
+        conversion) was produced from the unchanged ``vtt_path`` with the
+        same options.
+        """
+        row = self._db.execute(
+            'SELECT input, input_size, input_mtime_ns, options FROM outputs WHERE output = ?',
+            (str(md_path.resolve()),)).fetchone()
+        if row is None or not md_path.exists():
+            return False
+        stat = vtt_path.stat()
+        return row == (str(vtt_path.resolve()), stat.st_size, stat.st_mtime_ns, opts_key)
+
+    def restore(self, key: str, path_for_part) -> bool:
+        """
+        Write the cached Markdown for ``key``; False on a cache miss.
+
+        ``path_for_part(index)`` gives the destination of each output file
+        (0-based), so split conversions are restored part by part.
+        """
+        row = self._db.execute('SELECT content FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return False
+        decompressor = zlib.decompressobj()
+        content = memoryview(row[0])
+        index = 0
+        out = _open_output(path_for_part(index))
+        try:
+            # One extra step past the end yields an empty slice, which flushes the decompressor
+            for offset in range(0, len(content) + _IO_CHUNK_SIZE, _IO_CHUNK_SIZE):
+                data = content[offset:offset + _IO_CHUNK_SIZE]
+                data = decompressor.decompress(data) if data else decompressor.flush()
+                # Output files are separated by NUL, which never occurs in Markdown
+                *completed, data = data.split(_PART_SEPARATOR)
+                for segment in completed:
+                    out.write(segment)
+                    out.close()
+                    index += 1
+                    out = _open_output(path_for_part(index))
+                out.write(data)
+        finally:
+            out.close()
+        with self._db:
+            self._db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        return True
+
+    def store(self, key: str, md_paths) -> None:
+        """Compress the output files ``md_paths`` into the cache under ``key`` and evict old entries."""
+        compressor = zlib.compressobj()
+        parts = []
+        for index, md_path in enumerate(md_paths):
+            if index:
+                parts.append(compressor.compress(_PART_SEPARATOR))
+            with open(md_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_IO_CHUNK_SIZE), b''):
+                    parts.append(compressor.compress(chunk))
+        parts.append(compressor.flush())
+        content = b''.join(parts)
+        if len(content) > self.max_bytes:
+            return
+        with self._db:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                             (key, content, len(content), time.time()))
+            self._evict()
+
+    def record_output(self, vtt_path: Path, md_path: Path, opts_key: str, key: str) -> None:
+        stat = vtt_path.stat()
+        with self._db:
+            self._db.execute('INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?)',
+                             (str(md_path.resolve()), str(vtt_path.resolve()), stat.st_size, stat.st_mtime_ns, opts_key, key))
+
+    def _evict(self) -> None:
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
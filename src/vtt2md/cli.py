@@ -0,0 +1,423 @@
+"""
+Headless command line entry point for batch conversion.
+
+    python -m vtt2md meetings/ extra/*.vtt -o out/ -j 8 --datetime "2025-01-31 14:30"
+
+Inputs may be files, directories or glob patterns. Files are converted in
+parallel across a process pool and a throughput summary is printed at the
+end. Per-file metadata can be given in a sidecar ``<name>.meta.json`` next
+to the VTT file (``{"meeting_datetime": "YYYY-MM-DD HH:MM"}``), which takes
+precedence over the command line.
+
+Unless ``--no-cache`` is given, a conversion cache next to the output lets
+re-runs skip unchanged inputs or restore their Markdown from the cache.
+``vtt2md watch DIR`` keeps converting new files as they arrive (see
+:mod:`vtt2md.watch`).
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from vtt2md.cache import (
+    ConversionCache, DEFAULT_MAX_BYTES, content_key, default_cache_path, file_date_option, options_key,
+)
+from vtt2md.converter import (
+    VttConverter, MEETING_DATETIME_FORMAT, DEFAULT_MERGE_THRESHOLD_SECONDS, DEFAULT_SPLIT_MAX_CHARS,
+)
+from vtt2md.fillers import FillerFilter, load_word_list
+from vtt2md.profiling import ConversionStats, format_stats, profile_to, sum_stats
+from vtt2md.renderers import OUTPUT_FORMATS, get_renderer
+
+SIDECAR_SUFFIX = '.meta.json'
+NO_CAPTIONS_ERROR = "Could not find any captions in the VTT file."
+
+
+def collect_inputs(patterns, recursive: bool = False) -> list[Path]:
+    """Expand files, directories and glob patterns into a sorted list of unique .vtt paths."""
+    found = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = path.rglob('*.vtt') if recursive else path.glob('*.vtt')
+        elif glob.has_magic(pattern):
+            matches = (Path(p) for p in glob.glob(pattern, recursive=recursive))
+        else:
+            matches = [path]
+        for match in matches:
+            if match.suffix.lower() == '.vtt':
+                found.setdefault(match.resolve(), match)
+    return sorted(found.values())
+
+
+def load_metadata(vtt_path: Path, defaults: dict) -> dict:
+    """
+    Merge the sidecar metadata for ``vtt_path`` (if any) over ``defaults``.
+    Raises ``ValueError`` for an unknown ``output_format``.
+    """
+    metadata = dict(defaults)
+    sidecar = vtt_path.with_name(vtt_path.stem + SIDECAR_SUFFIX)
+    if sidecar.is_file():
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            metadata.update(json.load(f))
+    if metadata.get('output_format', 'md') not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown output_format {metadata['output_format']!r} "
+                         f"(expected one of {', '.join(OUTPUT_FORMATS)})")
+    return metadata
+
+
+def output_path_for(vtt_path: Path, output_dir: Path | None, split: bool = False,
+                    output_format: str = 'md') -> Path:
+    """The output file for ``vtt_path``, or the folder holding its parts when ``split``."""
+    base = (output_dir or vtt_path.parent) / vtt_path.stem
+    if split:
+        return base
+    extension = '.md' if output_format == 'md' else get_renderer(output_format).extension
+    return base.with_name(f"{vtt_path.stem}{extension}")
+
+
+def output_collisions(pairs) -> dict:
+    """
+    Given ``(vtt_path, md_path)`` pairs, map every input whose output would
+    also be written by another input to the list of those other inputs.
+
+    Inputs with the same name from different folders would share one
+    output and one cache entry, so callers refuse them instead of letting
+    one overwrite the other.
+    """
+    by_output = {}
+    for vtt_path, md_path in pairs:
+        by_output.setdefault(os.path.normcase(md_path.resolve()), []).append(vtt_path)
+    collisions = {}
+    for inputs in by_output.values():
+        if len(inputs) > 1:
+            for vtt_path in inputs:
+                collisions[vtt_path] = [other for other in inputs if other != vtt_path]
+    return collisions
+
+
+def collision_error(md_path: Path, others) -> str:
+    return f"output {md_path} would also be written by {', '.join(str(other) for other in others)}"
+
+
+def part_path(folder: Path, index: int) -> Path:
+    # Same layout as the GUI: <folder>/<folder name>_part<n>.md
+    return folder / f"{folder.name}_part{index + 1}.md"
+
+
+def _remove_parts(folder: Path) -> None:
+    if folder.is_dir():
+        for stale in folder.glob(f"{glob.escape(folder.name)}_part*.md"):
+            stale.unlink()
+
+
+def _write_chunks(path: Path, chunks, newline: str | None = None) -> None:
+    try:
+        with open(path, 'w', encoding='utf-8', newline=newline) as out:
+            out.writelines(chunks)
+    except BaseException:
+        # Do not leave truncated output behind
+        path.unlink(missing_ok=True)
+        raise
+
+
+def write_outputs(converter: VttConverter, md_path: Path, split_max_chars: int | None,
+                  output_format: str = 'md') -> list[Path]:
+    """
+    Stream the conversion into ``md_path`` (a file, or a folder of parts) and
+    return the files written. A transcript without captions raises
+    ``ValueError`` before any output is replaced; output left truncated by a
+    later failure is removed.
+    """
+    if output_format != 'md':
+        chunks = converter.iter_rendered(get_renderer(output_format))
+    elif not split_max_chars:
+        chunks = converter.iter_markdown()
+    else:
+        chunks = converter.iter_markdown_parts(split_max_chars)
+    # The first chunk comes after the pre-scan, which counts the cues
+    first = next(chunks)
+    if not converter.cue_count:
+        raise ValueError(NO_CAPTIONS_ERROR)
+    chunks = itertools.chain([first], chunks)
+    if output_format != 'md' or not split_max_chars:
+        md_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_chunks(md_path, chunks, newline='\n' if output_format != 'md' else None)
+        return [md_path]
+
+    _remove_parts(md_path)
+    md_path.mkdir(parents=True, exist_ok=True)
+    written = []
+    try:
+        for index, part in enumerate(chunks):
+            written.append(part_path(md_path, index))
+            with open(written[-1], 'w', encoding='utf-8') as out:
+                out.write(part)
+    except BaseException:
+        _remove_parts(md_path)
+        raise
+    return written
+
+
+def conversion_options(vtt_path: Path, metadata: dict) -> dict:
+    """Everything that changes the rendered output for ``vtt_path``; used as the cache key."""
+    output_format = metadata.get('output_format', 'md')
+    options = {
+        'title': vtt_path.stem,
+        'merge_threshold_seconds': metadata.get('merge_threshold_seconds', DEFAULT_MERGE_THRESHOLD_SECONDS),
+        'meeting_datetime': metadata.get('meeting_datetime'),
+        'remove_fillers': bool(metadata.get('remove_fillers')),
+        'fillers': metadata.get('fillers'),
+        # Only Markdown can be split into parts
+        'split_max_chars': metadata.get('split_max_chars') if output_format == 'md' else None,
+        'format': output_format,
+        'speaker_stats': bool(metadata.get('speaker_stats')),
+    }
+    if not options['meeting_datetime']:
+        options['file_date'] = file_date_option(vtt_path)
+    return options
+
+
+def convert_file(vtt_path: Path, md_path: Path, metadata: dict, cache_max_bytes: int | None = None,
+                 profile: bool = False, segment_workers: int = 1, profile_memory: bool = False) -> dict:
+    """
+    Convert one file; runs inside a worker process.
+
+    ``md_path`` is the output file, or the output folder in split mode.
+    With ``cache_max_bytes`` set, the conversion cache next to ``md_path``
+    is consulted first. With ``profile`` the per-stage statistics are
+    returned under ``'stats'``, including peak allocations per stage when
+    ``profile_memory`` is also set. ``segment_workers`` > 1 parses and
+    merges a large file in parallel segments (see :mod:`vtt2md.parallel`).
+    Returns a result dict instead of raising so one bad file does not abort
+    the whole batch.
+    """
+    result = {'input': str(vtt_path), 'output': str(md_path), 'status': 'converted',
+              'cues': 0, 'bytes': 0, 'error': None, 'stats': None}
+    cache = None
+    # Set while restoring from the cache replaces md_path; earlier failures leave existing output alone
+    restoring = False
+    try:
+        options = conversion_options(vtt_path, metadata)
+        # Built first: it validates the metadata before any output is touched
+        filler_filter = FillerFilter(fillers=options['fillers']) if options['fillers'] else None
+        stats = ConversionStats(trace_memory=profile_memory) if profile else None
+        converter = VttConverter(vtt_path, str(vtt_path),
+                                 meeting_datetime=options['meeting_datetime'],
+                                 merge_threshold_seconds=options['merge_threshold_seconds'],
+                                 remove_fillers=options['remove_fillers'],
+                                 filler_filter=filler_filter,
+                                 stats=stats,
+                                 speaker_stats=options['speaker_stats'],
+                                 workers=segment_workers)
+        if cache_max_bytes is not None:
+            cache = ConversionCache(default_cache_path(md_path), max_bytes=cache_max_bytes)
+            opts_key = options_key(options)
+            split = bool(options['split_max_chars'])
+            if (cache.is_up_to_date(vtt_path, md_path, opts_key)
+                    and (not split or part_path(md_path, 0).exists())):
+                result['status'] = 'skipped'
+                return result
+            key = content_key(vtt_path, opts_key)
+            restoring = True
+            if split:
+                _remove_parts(md_path)
+            if cache.restore(key, (lambda i: part_path(md_path, i)) if split else (lambda i: md_path)):
+                cache.record_output(vtt_path, md_path, opts_key, key)
+                result['status'] = 'cached'
+                return result
+            restoring = False
+
+        result['bytes'] = vtt_path.stat().st_size
+        written = write_outputs(converter, md_path, options['split_max_chars'], options['format'])
+        result['cues'] = converter.cue_count or 0
+        if stats is not None:
+            result['stats'] = stats.as_dict()
+
+        if cache is not None:
+            cache.store(key, written)
+            cache.record_output(vtt_path, md_path, opts_key, key)
+    except Exception as e:
+        result['error'] = str(e)
+        # write_outputs() cleans up after itself; a failed restore may have left a partial file
+        if restoring:
+            if md_path.is_dir():
+                _remove_parts(md_path)
+            else:
+                md_path.unlink(missing_ok=True)
+    finally:
+        if cache is not None:
+            cache.close()
+    return result
+
+
+def run_batch(jobs, workers: int, cache_max_bytes: int | None = None, profile: bool = False,
+              profile_memory: bool = False):
+    """
+    Yield conversion results for ``jobs`` ((vtt_path, md_path, metadata) tuples).
+
+    A single file gets all ``workers`` for a segmented parallel merge instead.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield convert_file(*job, cache_max_bytes, profile, segment_workers=workers, profile_memory=profile_memory)
+        return
+    # Imported here: multiprocessing is the bulk of the CLI's import time and unused for single files
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(convert_file, *zip(*jobs), [cache_max_bytes] * len(jobs), [profile] * len(jobs),
+                                [1] * len(jobs), [profile_memory] * len(jobs))
+
+
+def format_summary(file_count: int, cue_count: int, byte_count: int, elapsed: float) -> str:
+    elapsed = max(elapsed, 1e-9)
+    return (f"{file_count} files, {cue_count} cues, {byte_count / 1e6:.1f} MB in {elapsed:.2f}s "
+            f"({file_count / elapsed:.1f} files/s, {cue_count / elapsed:.0f} cues/s, "
+            f"{byte_count / 1e6 / elapsed:.1f} MB/s)")
+
+
+def add_conversion_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by batch conversion and ``vtt2md watch``."""
+    parser.add_argument('-o', '--output-dir', type=Path,
+                        help="directory for the .md files (default: next to each input)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="search directories recursively")
+    parser.add_argument('--datetime', dest='meeting_datetime',
+                        help="meeting date and time as 'YYYY-MM-DD HH:MM' (sidecar files override this)")
+    parser.add_argument('--merge-threshold', dest='merge_threshold_seconds', type=int,
+                        default=DEFAULT_MERGE_THRESHOLD_SECONDS,
+                        help="merge consecutive cues of one speaker within this many seconds (default: %(default)s)")
+    parser.add_argument('--remove-fillers', action='store_true',
+                        help="remove fillers (えー, あのー, um, ...) and pure backchannel cues (うん, はい, ...)")
+    parser.add_argument('--filler-list', type=Path,
+                        help="file with one filler per line to use instead of the built-in list")
+    parser.add_argument('--split', dest='split_max_chars', type=int, nargs='?', const=DEFAULT_SPLIT_MAX_CHARS,
+                        metavar='MAX_CHARS',
+                        help="split into <name>/<name>_partN.md files of at most MAX_CHARS characters "
+                             "(default: %(const)s), cut between speaker turns")
+    parser.add_argument('--speaker-stats', action='store_true',
+                        help="append a 発言統計 section (turns, talk time, share and characters per speaker)")
+    parser.add_argument('-f', '--format', dest='output_format', choices=OUTPUT_FORMATS, default='md',
+                        help="output format: Markdown, JSON Lines (one turn per line) or TSV "
+                             "(speaker id table plus turn rows with ms offsets) (default: %(default)s)")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="maximum conversion cache size in MB per output directory (default: %(default)s)")
+
+
+def conversion_defaults(args, parser: argparse.ArgumentParser) -> dict:
+    """Validate the shared options and turn them into the metadata defaults for every file."""
+    defaults = {'merge_threshold_seconds': args.merge_threshold_seconds,
+                'remove_fillers': args.remove_fillers or args.filler_list is not None,
+                'split_max_chars': args.split_max_chars,
+                'output_format': args.output_format,
+                'speaker_stats': args.speaker_stats}
+    if args.split_max_chars and args.output_format != 'md':
+        parser.error("--split is only supported for Markdown output")
+    if args.filler_list:
+        try:
+            defaults['fillers'] = load_word_list(args.filler_list)
+        except OSError as e:
+            parser.error(f"cannot read --filler-list: {e}")
+    if args.meeting_datetime:
+        try:
+            time.strptime(args.meeting_datetime, MEETING_DATETIME_FORMAT)
+        except ValueError:
+            parser.error("--datetime must be in 'YYYY-MM-DD HH:MM' format")
+        defaults['meeting_datetime'] = args.meeting_datetime
+    return defaults
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='vtt2md', description="Convert Teams VTT transcripts to Markdown.",
+                                     epilog="Run 'vtt2md watch DIR' to convert new transcripts as they arrive.")
+    parser.add_argument('inputs', nargs='+', help=".vtt files, directories or glob patterns")
+    add_conversion_arguments(parser)
+    parser.add_argument('--profile', action='store_true',
+                        help="print per-stage timings (scan/parse/merge/render/write) for each file and in total")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="like --profile, plus the peak traced memory allocation per stage (slower)")
+    parser.add_argument('--profile-dump', type=Path, metavar='PATH',
+                        help="write cProfile stats (readable with pstats) to PATH; converts in-process")
+    parser.add_argument('--no-cache', action='store_true', help="disable the conversion cache")
+    return parser
+
+
+def main(argv=None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == 'watch':
+        from vtt2md.watch import main as watch_main
+        return watch_main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    defaults = conversion_defaults(args, parser)
+
+    vtt_paths = collect_inputs(args.inputs, recursive=args.recursive)
+    if not vtt_paths:
+        print("No .vtt files found.", file=sys.stderr)
+        return 1
+
+    jobs = []
+    for vtt_path in vtt_paths:
+        try:
+            metadata = load_metadata(vtt_path, defaults)
+        except (OSError, ValueError) as e:
+            print(f"FAILED {vtt_path}: invalid sidecar metadata: {e}", file=sys.stderr)
+            continue
+        output_format = metadata.get('output_format', 'md')
+        md_path = output_path_for(vtt_path, args.output_dir,
+                                  split=bool(metadata.get('split_max_chars')) and output_format == 'md',
+                                  output_format=output_format)
+        jobs.append((vtt_path, md_path, metadata))
+
+    # Same-named inputs from different folders (-r, several directories)
+    collisions = output_collisions((vtt_path, md_path) for vtt_path, md_path, _ in jobs)
+    for vtt_path, md_path, _ in jobs:
+        if vtt_path in collisions:
+            print(f"FAILED {vtt_path}: {collision_error(md_path, collisions[vtt_path])}", file=sys.stderr)
+    jobs = [job for job in jobs if job[0] not in collisions]
+
+    failures = len(vtt_paths) - len(jobs)
+    cache_max_bytes = None if args.no_cache else args.cache_size * 1024 * 1024
+    workers = 1 if args.profile_dump else args.workers
+    converted = cue_count = byte_count = 0
+    reused = {'cached': 0, 'skipped': 0}
+    all_stats = []
+    started = time.perf_counter()
+    with profile_to(args.profile_dump) if args.profile_dump else nullcontext():
+        for result in run_batch(jobs, workers, cache_max_bytes, args.profile or args.profile_memory,
+                                args.profile_memory):
+            if result['error']:
+                failures += 1
+                print(f"FAILED {result['input']}: {result['error']}", file=sys.stderr)
+                continue
+            if result['status'] in reused:
+                reused[result['status']] += 1
+                continue
+            cue_count += result['cues']
+            byte_count += result['bytes']
+            converted += 1
+            print(f"{result['input']} -> {result['output']}")
+            if result['stats']:
+                all_stats.append(result['stats'])
+                print(format_stats(result['stats']))
+    elapsed = time.perf_counter() - started
+
+    print(format_summary(converted, cue_count, byte_count, elapsed))
+    if cache_max_bytes is not None:
+        print(f"{reused['skipped']} unchanged file(s) skipped, {reused['cached']} restored from cache.")
+    if len(all_stats) > 1:
+        print("Total per stage (summed over files):")
+        print(format_stats(sum_stats(all_stats)))
+    if args.profile_dump:
+        print(f"cProfile stats written to {args.profile_dump}")
+    if failures:
+        print(f"{failures} file(s) failed.", file=sys.stderr)
+    return 1 if failures else 0
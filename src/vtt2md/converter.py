@@ -1,112 +1,796 @@
-import webvtt
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-import io
+from typing import NamedTuple
+import codecs
+import itertools
+import mmap
 import re
 import os
+import time
+
+from vtt2md.fillers import FillerFilter, default_filler_filter
+from vtt2md.profiling import ConversionStats
+from vtt2md.renderers import Document, Renderer
+
+# MS Teams writes a "<uuid>/<n>-<m>" identifier line before every cue
+_TEAMS_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-([0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}/\d+-\d+\s*$')
+# Any cue tag; the group captures the annotation of "<v Speaker>" / "<v.class Speaker>"
+_CUE_TAG_RE = re.compile(r'<(?:v(?:\.[^\s>]*)?[ \t]+([^>]+)|[^>]*)>')
+_SKIPPED_BLOCKS = ('NOTE', 'STYLE', 'REGION')
+_READ_CHUNK_SIZE = 64 * 1024
+# Bytes inspected to tell UTF-8 from Shift_JIS
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+MEETING_DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+DEFAULT_MERGE_THRESHOLD_SECONDS = 60
+# The GUI's "複数ファイルに分割 (10000字以下)" option
+DEFAULT_SPLIT_MAX_CHARS = 10000
+# "2025-01-31 14:30", "2025/1/31", "20250131_1430", "2025年1月31日 14時30分"
+_DATETIME_HINT_RE = re.compile(
+    r'(?<!\d)(20\d\d)[-/._年]?(\d{1,2})[-/._月]?(\d{1,2})日?(?:[ _T\-]*(\d{1,2})[:時]?(\d{2})分?)?(?!\d)')
+# Cues between progress reports / cancellation checks
+_PROGRESS_BATCH = 1000
+_SENTENCE_ENDS = ('。', '．', '！', '？', '. ', '! ', '? ')
+
+
+class Cue(NamedTuple):
+    """A single VTT cue as yielded by :func:`iter_cues`, timed in integer milliseconds."""
+    start_ms: int
+    end_ms: int
+    raw_text: str
+
+    @property
+    def start(self) -> str:
+        return _format_timestamp(self.start_ms, with_millis=True)
+
+    @property
+    def end(self) -> str:
+        return _format_timestamp(self.end_ms, with_millis=True)
+
+
+def _parse_timestamp_ms(timestamp: str) -> int:
+    """Parse a VTT timestamp ("HH:MM:SS.mmm" or "MM:SS.mmm") into milliseconds."""
+    # Fast path for the fixed-width form every Teams export uses
+    if len(timestamp) == 12 and timestamp[2] == ':' and timestamp[5] == ':' and timestamp[8] == '.':
+        return (int(timestamp[0:2]) * 3600000 + int(timestamp[3:5]) * 60000
+                + int(timestamp[6:8]) * 1000 + int(timestamp[9:12]))
+    clock, _, millis = timestamp.partition('.')
+    fields = clock.split(':')
+    if len(fields) == 2:
+        fields.insert(0, '0')
+    if len(fields) != 3 or len(millis) > 3:
+        raise ValueError(f"Invalid VTT timestamp: {timestamp!r}")
+    hours, minutes, seconds = fields
+    return ((int(hours) * 3600 + int(minutes) * 60 + int(seconds)) * 1000
+            + (int(millis.ljust(3, '0')) if millis else 0))
+
+
+def _format_timestamp(ms: int, with_millis: bool = False) -> str:
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if with_millis:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _iter_str_lines(content: str):
+    # Walk the string with find() instead of splitlines() so no list of every line is built
+    pos = 0
+    length = len(content)
+    while pos < length:
+        idx = content.find('\n', pos)
+        if idx < 0:
+            yield content[pos:].rstrip('\r')
+            return
+        yield content[pos:idx].rstrip('\r')
+        pos = idx + 1
+
+
+def _split_lines(text_chunks):
+    pending = ''
+    for chunk in text_chunks:
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def detect_encoding(head: bytes) -> str:
+    """
+    Pick the codec for a VTT file from its first bytes: a BOM if present,
+    otherwise UTF-8 when ``head`` decodes as UTF-8 and CP932 (the Windows
+    superset of Shift_JIS) when it does not.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        # Not final: ``head`` may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp932'
+
+
+def _decode_chunks(byte_chunks):
+    """
+    Incrementally decode byte chunks, detecting the encoding from the first
+    ``_ENCODING_SAMPLE_SIZE`` bytes, or from the first non-ASCII bytes when
+    those are all ASCII.
+    """
+    byte_chunks = iter(byte_chunks)
+    head = []
+    head_size = 0
+    for chunk in byte_chunks:
+        head.append(chunk)
+        head_size += len(chunk)
+        if head_size >= _ENCODING_SAMPLE_SIZE:
+            break
+    if not head_size:
+        return
+    head = b''.join(head)
+    encoding = detect_encoding(head)
+    if encoding == 'utf-8' and head.isascii():
+        # ASCII reads the same in UTF-8 and CP932; detect again from the first non-ASCII chunk
+        yield head.decode('ascii')
+        for chunk in byte_chunks:
+            if not chunk.isascii():
+                yield from _decode_chunks(itertools.chain([chunk], byte_chunks))
+                return
+            if chunk:
+                yield chunk.decode('ascii')
+        return
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in itertools.chain([head], byte_chunks):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def _iter_mmap_chunks(path, chunk_size: int):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                yield mapped[offset:offset + chunk_size]
+
+
+def _iter_file_chunks(f, chunk_size: int):
+    chunks = iter(lambda: f.read(chunk_size), f.read(0))
+    first = next(chunks, None)
+    if first is None:
+        return
+    if isinstance(first, bytes):
+        # Binary file objects get the same encoding detection as paths
+        yield from _decode_chunks(itertools.chain([first], chunks))
+    else:
+        yield first
+        yield from chunks
+
+
+def _iter_lines(source, chunk_size: int):
+    if isinstance(source, str):
+        yield from _iter_str_lines(source)
+    elif isinstance(source, os.PathLike):
+        # Map the file and decode it slice by slice instead of reading it into one string
+        yield from _split_lines(_decode_chunks(_iter_mmap_chunks(source, chunk_size)))
+    else:
+        yield from _split_lines(_iter_file_chunks(source, chunk_size))
+
+
+def _extract_speaker_fragments(raw_text: str) -> list:
+    """
+    Return one ``(speaker, text)`` fragment per voice in a cue, in a single
+    pass over ``raw_text``.
+
+    A new fragment starts at every ``<v ...>`` span naming a different
+    speaker; text before the first voice span belongs to it. Every cue tag
+    (``<v>``, ``<c>``, ``<i>``, ``<lang>``, inline timestamps, ...) is
+    removed from the text. Line breaks inside multi-line cues are kept. A
+    cue without a voice span is a single fragment with speaker ``None``.
+    """
+    if '<' not in raw_text:
+        return [(None, raw_text.strip())]
+    # split() alternates text runs with the voice-name group (None for other tags)
+    parts = _CUE_TAG_RE.split(raw_text)
+    fragments = []
+    speaker = None
+    pieces = [parts[0]]
+    for index in range(1, len(parts), 2):
+        name = parts[index] and parts[index].strip()
+        if name and name != speaker:
+            if speaker is not None:
+                fragments.append((speaker, ''.join(pieces).strip()))
+                pieces = []
+            speaker = name
+        pieces.append(parts[index + 1])
+    fragments.append((speaker, ''.join(pieces).strip()))
+    return fragments
+
+
+def _split_duration(duration_ms: int, voices: list) -> list:
+    # Talk time of a cue with several voices is shared by text length; the last one gets the rounding rest
+    total = sum(len(text) for _, text in voices)
+    shares = [duration_ms * len(text) // total for _, text in voices]
+    shares[-1] += duration_ms - sum(shares)
+    return shares
+
+
+def iter_cues(source, chunk_size: int = _READ_CHUNK_SIZE):
+    """
+    Incrementally parse VTT cues from ``source``.
+
+    ``source`` may be the VTT text itself (``str``), a path (``os.PathLike``)
+    or a text or binary file object, read ``chunk_size`` characters/bytes at a
+    time. Paths are memory-mapped and decoded incrementally; the encoding of
+    paths and binary files (UTF-8, UTF-8/16 with BOM or Shift_JIS) is
+    detected from the first chunk.
+    MS Teams UUID identifier lines are dropped on the fly, and only one cue
+    is held in memory at a time.
+    """
+    lines = _iter_lines(source, chunk_size)
+    header = next(lines, None)
+    if header is None or not header.lstrip('\ufeff').startswith('WEBVTT'):
+        raise ValueError("Invalid VTT file: missing WEBVTT header")
+
+    start = end = None
+    text_lines = []
+    block_started = True  # the header block
+    skip_block = False
+    for line in lines:
+        if not line.strip():
+            if start is not None and text_lines:
+                yield Cue(start, end, '\n'.join(text_lines))
+            start = end = None
+            text_lines = []
+            block_started = skip_block = False
+            continue
+        if _TEAMS_UUID_RE.match(line):
+            continue
+        if start is not None:
+            text_lines.append(line)
+            continue
+        if skip_block:
+            continue
+        if '-->' in line:
+            start_str, _, rest = line.partition('-->')
+            start = _parse_timestamp_ms(start_str.strip())
+            end = _parse_timestamp_ms(rest.split()[0])
+            continue
+        if not block_started and line.startswith(_SKIPPED_BLOCKS):
+            skip_block = True
+        # Anything else before the timing line is a cue identifier
+        block_started = True
+
+    if start is not None and text_lines:
+        yield Cue(start, end, '\n'.join(text_lines))
+
+
+class ConversionCancelled(Exception):
+    """Raised when a conversion is stopped through its ``cancel_event``."""
+
+
+class Turn(NamedTuple):
+    """A merged speaker turn as yielded by :func:`merge_turns`."""
+    speaker: str
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+class SpeakerTable:
+    """
+    Speakers interned to small integer ids in order of appearance, with
+    per-speaker aggregates filled in by :func:`merge_turns`: turn count,
+    talk time (sum of cue durations in ms) and character count.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.turn_counts = []
+        self.talk_ms = []
+        self.char_counts = []
+
+    def intern(self, name: str) -> int:
+        speaker_id = self.ids.get(name)
+        if speaker_id is None:
+            speaker_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.turn_counts.append(0)
+            self.talk_ms.append(0)
+            self.char_counts.append(0)
+        return speaker_id
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def merge_turns(cues, merge_threshold_seconds=DEFAULT_MERGE_THRESHOLD_SECONDS,
+                filler_filter: FillerFilter | None = None, speakers: SpeakerTable | None = None):
+    """
+    Merge consecutive cues from the same speaker into :class:`Turn` records.
+
+    With a ``filler_filter``, fillers are removed from each cue and pure
+    backchannel cues are dropped before they reach the merge. With a
+    ``speakers`` table, speaker names are interned into it (turns share one
+    string per speaker) and its aggregates are updated as cues stream by.
+
+    A cue with several voice spans contributes one fragment per voice, each
+    with the cue's timing. Cues are merged while the gap since the previous
+    cue's end is within ``merge_threshold_seconds``. Text fragments are collected in a list and
+    joined once when the turn closes, so the cost stays linear in the
+    number of cues even for very long monologues.
+    """
+    threshold_ms = merge_threshold_seconds * 1000
+    speaker = None
+    start_ms = end_ms = 0
+    fragments = []
+    for cue in cues:
+        voices = _extract_speaker_fragments(cue.raw_text)
+        if len(voices) == 1:
+            # The common single-voice cue, without building new lists
+            name, text = voices[0]
+            if filler_filter is not None and name and text:
+                text = filler_filter.clean(text)
+                voices = [(name, text)]
+            if not name or not text:
+                continue
+        else:
+            voices = [(name, text) for name, text in voices if name and text]
+            if filler_filter is not None:
+                voices = [(name, text) for name, text in ((name, filler_filter.clean(text)) for name, text in voices)
+                          if text]
+            if not voices:
+                continue
+        if speakers is not None:
+            duration_ms = cue.end_ms - cue.start_ms
+            talk_shares = [duration_ms] if len(voices) == 1 else _split_duration(duration_ms, voices)
+
+        for index, (cue_speaker, text) in enumerate(voices):
+            if speakers is not None:
+                speaker_id = speakers.intern(cue_speaker)
+                cue_speaker = speakers.names[speaker_id]
+                speakers.talk_ms[speaker_id] += talk_shares[index]
+                speakers.char_counts[speaker_id] += len(text)
+
+            # If the last speaker is the same and within the time threshold, combine the text
+            if cue_speaker == speaker and cue.start_ms - end_ms <= threshold_ms:
+                fragments.append(text)
+                end_ms = cue.end_ms
+                continue
+
+            if speakers is not None:
+                speakers.turn_counts[speaker_id] += 1
+
+            if fragments:
+                yield Turn(speaker, start_ms, end_ms, ' '.join(fragments))
+            speaker = cue_speaker
+            start_ms = cue.start_ms
+            end_ms = cue.end_ms
+            fragments = [text]
+    if fragments:
+        yield Turn(speaker, start_ms, end_ms, ' '.join(fragments))
+
+
+def _render_turn(speaker: str, start_ms: int, text: str) -> str:
+    return f"\n**{speaker}** [{_format_timestamp(start_ms)}]  \n{text}\n"
+
+
+def _escape_table_cell(text: str) -> str:
+    return text.replace('|', '\\|')
+
+
+def _render_speaker_stats(speakers: SpeakerTable) -> str:
+    """The "発言統計" section: one row per speaker, longest talk time first."""
+    total_ms = sum(speakers.talk_ms) or 1
+    lines = ["\n## 発言統計\n", "| 話者 | 発言数 | 発言時間 | 割合 | 文字数 |", "|---|---:|---:|---:|---:|"]
+    for speaker_id in sorted(range(len(speakers)), key=lambda i: (-speakers.talk_ms[i], speakers.names[i])):
+        talk_ms = speakers.talk_ms[speaker_id]
+        lines.append(f"| {_escape_table_cell(speakers.names[speaker_id])} | {speakers.turn_counts[speaker_id]} | "
+                     f"{_format_timestamp(talk_ms)} | {talk_ms * 100 / total_ms:.1f}% | "
+                     f"{speakers.char_counts[speaker_id]} |")
+    return "\n".join(lines) + "\n"
+
+
+def _split_text(text: str, limit: int):
+    """Split ``text`` into a head of at most ``limit`` characters and the rest."""
+    if len(text) <= limit:
+        return text, ''
+    window = text[:limit]
+    cut = max(window.rfind(mark) for mark in _SENTENCE_ENDS) + 1
+    if cut <= 0:
+        cut = max(window.rfind(' '), window.rfind('\n')) + 1
+    if cut <= 0:
+        cut = limit
+    return text[:cut].rstrip(), text[cut:].lstrip()
+
+
+def guess_meeting_datetime(path) -> str:
+    """
+    Best-effort meeting date and time ("YYYY-MM-DD HH:MM") for a VTT file,
+    used as a default instead of asking for it per file.
+
+    Looks for a date (and optional time) in the ``WEBVTT`` header and the
+    NOTE blocks before the first cue, then in the file name, and finally
+    falls back to the file modification time. Cue identifiers (such as
+    Teams UUIDs, whose hex digits can look like a date) are never read.
+    """
+    path = Path(path)
+    candidates = []
+    try:
+        in_header = True
+        keep_block = True
+        block_start = False
+        for line in _iter_lines(path, _READ_CHUNK_SIZE):
+            if '-->' in line:
+                break
+            if not line.strip():
+                in_header = False
+                block_start = True
+                continue
+            if block_start:
+                keep_block = line.startswith('NOTE')
+                block_start = False
+            if (in_header or keep_block) and not _TEAMS_UUID_RE.match(line):
+                candidates.append(line)
+    except (OSError, UnicodeDecodeError):
+        pass
+    candidates.append(path.stem)
+    for text in candidates:
+        match = _DATETIME_HINT_RE.search(text)
+        if match:
+            year, month, day, hour, minute = match.groups()
+            try:
+                guessed = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0))
+            except ValueError:
+                continue
+            return guessed.strftime(MEETING_DATETIME_FORMAT)
+    return datetime.fromtimestamp(os.path.getmtime(path)).strftime(MEETING_DATETIME_FORMAT)
+
 
 class VttConverter:
-    def __init__(self, vtt_content: str, file_path: str):
+    def __init__(self, vtt_content, file_path: str, meeting_datetime: str | None = None,
+                 merge_threshold_seconds=DEFAULT_MERGE_THRESHOLD_SECONDS, remove_fillers: bool = False,
+                 filler_filter: FillerFilter | None = None, stats: ConversionStats | None = None,
+                 progress_callback=None, cancel_event=None, speaker_stats: bool = False, workers: int = 1):
+        # vtt_content may also be a path or a seekable text file; it is re-read per pass
         self.vtt_content = vtt_content
         self.file_path = Path(file_path)
-        self.captions = self._parse_vtt()
+        # "YYYY-MM-DD HH:MM"; falls back to the file modification date when omitted
+        self.meeting_datetime = (
+            datetime.strptime(meeting_datetime, MEETING_DATETIME_FORMAT) if meeting_datetime else None
+        )
+        self.merge_threshold_seconds = merge_threshold_seconds
+        if remove_fillers and filler_filter is None:
+            filler_filter = default_filler_filter()
+        self.filler_filter = filler_filter if remove_fillers else None
+        self.cue_count = None
+        # Appends a "発言統計" section; self.speakers holds the aggregates after any conversion
+        self.speaker_stats = speaker_stats
+        self.speakers = None
+        self.stats = stats
+        # progress_callback(stage, cues_done, cues_total) is called from the converting thread;
+        # cancel_event is any object with is_set(), e.g. threading.Event
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        # Processes for parsing and merging a large path input in segments (see vtt2md.parallel)
+        self.workers = workers
+        self._segment_turns = None
+        self._scanned = None
+        self._start_pos = None
+        if hasattr(vtt_content, 'read'):
+            # SpooledTemporaryFile has no seekable() before Python 3.11 but always seeks
+            if hasattr(vtt_content, 'seekable') and not vtt_content.seekable():
+                raise ValueError("VTT file objects must be seekable")
+            self._start_pos = vtt_content.tell()
+        if stats is not None:
+            if isinstance(vtt_content, os.PathLike):
+                stats.input_size = os.path.getsize(vtt_content)
+            elif isinstance(vtt_content, str):
+                stats.input_size = len(vtt_content)
 
-    def _parse_vtt(self):
-        # Clean up potential UUID lines from MS Teams that can break the parser
-        cleaned_content = re.sub(r'^[0-9a-fA-F]{8}-([0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}/\d+-\d+\s*$', '', self.vtt_content, flags=re.MULTILINE)
-        return list(webvtt.from_buffer(io.StringIO(cleaned_content)))
+    def _iter_captions(self, stage: str = 'parse'):
+        if self._start_pos is not None:
+            self.vtt_content.seek(self._start_pos)
+        cues = iter_cues(self.vtt_content)
+        if self.progress_callback is not None or self.cancel_event is not None:
+            cues = self._watch(cues, stage, self.cue_count if stage == 'parse' else None)
+        if self.stats is not None:
+            return self.stats.timed(cues, stage)
+        return cues
 
-    def _get_speaker(self, raw_text: str):
-        match = re.match(r'<v\s+([^>]+)>', raw_text)
-        if match:
-            return match.group(1).strip()
-        return None
+    def _watch(self, cues, stage: str, total: int | None):
+        """Report progress and honour cancellation every ``_PROGRESS_BATCH`` cues."""
+        done = 0
+        for cue in cues:
+            yield cue
+            done += 1
+            if done % _PROGRESS_BATCH == 0:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    raise ConversionCancelled()
+                if self.progress_callback is not None:
+                    self.progress_callback(stage, done, total)
+        if self.progress_callback is not None:
+            self.progress_callback(stage, done, total if total is not None else done)
 
-    def _clean_text(self, raw_text: str):
-        # Remove speaker tag and other VTT tags
-        text = re.sub(r'<v\s+[^>]+>', '', raw_text)
-        text = re.sub(r'</?v>', '', text)
-        return text.strip()
+    @property
+    def captions(self):
+        return list(self._iter_captions())
 
-    def _merge_captions(self, merge_threshold_seconds=60):
-        if not self.captions:
-            return []
+    def _iter_merged_captions(self, merge_threshold_seconds=None):
+        """Yield merged speaker turns as soon as each one is closed."""
+        if merge_threshold_seconds is None:
+            if self._segment_turns is not None:
+                # Already merged in parallel by _scan(); handed out once
+                turns, self._segment_turns = iter(self._segment_turns), None
+                return self.stats.timed(turns, 'merge') if self.stats is not None else turns
+            merge_threshold_seconds = self.merge_threshold_seconds
+        self.speakers = SpeakerTable()
+        turns = merge_turns(self._iter_captions(), merge_threshold_seconds, self.filler_filter, self.speakers)
+        if self.stats is not None:
+            return self.stats.timed(turns, 'merge', exclusive_of=('parse',))
+        return turns
 
-        merged = []
-        for caption in self.captions:
-            speaker = self._get_speaker(caption.raw_text)
-            text = self._clean_text(caption.raw_text)
+    def _merge_captions(self, merge_threshold_seconds=None):
+        return list(self._iter_merged_captions(merge_threshold_seconds))
 
-            if not speaker or not text:
-                continue
-            
-            current_start_time = datetime.strptime(caption.start.split('.')[0], '%H:%M:%S')
+    def _scan(self):
+        """
+        Cheap pre-scan for the header: cue count, participants and the
+        first/last timestamps, without merging or keeping any cue around.
 
-            # If the last speaker is the same and within the time threshold, combine the text
-            if merged and merged[-1]['speaker'] == speaker:
-                last_end_time_str = merged[-1]['end'].split('.')[0]
-                last_end_time = datetime.strptime(last_end_time_str, '%H:%M:%S')
-                
-                if (current_start_time - last_end_time).total_seconds() <= merge_threshold_seconds:
-                    merged[-1]['text'] += ' ' + text
-                    merged[-1]['end'] = caption.end
-                    continue
+        With ``workers`` > 1 a large path input is instead parsed and merged
+        in parallel segments here, and the merged turns are kept for
+        :meth:`_iter_merged_captions`.
+        """
+        if self._scanned is not None:
+            # Already scanned by prescan(); handed out once
+            scanned, self._scanned = self._scanned, None
+            return scanned
+        if self.workers > 1 and isinstance(self.vtt_content, os.PathLike):
+            scanned = self._scan_in_parallel()
+            if scanned is not None:
+                return scanned
+        return self._scan_cues(self._iter_captions('scan'))
 
-            merged.append({
-                'speaker': speaker,
-                'text': text,
-                'start': caption.start,
-                'end': caption.end
-            })
-        return merged
+    def prescan(self, cues) -> None:
+        """
+        Run the header pre-scan over ``cues`` ahead of the conversion, e.g.
+        while the input is still arriving. ``cues`` must be the cues of
+        ``vtt_content``; the next conversion then starts with the header
+        instead of a scan pass of its own.
+        """
+        self._scanned = self._scan_cues(cues)
 
-    def to_markdown(self) -> str:
-        if not self.captions:
-            return "# Conversion Error\n\nCould not find any captions in the VTT file."
+    def _scan_cues(self, cues):
+        cue_count = 0
+        first_start_ms = last_end_ms = None
+        participants = set()
+        for caption in cues:
+            if first_start_ms is None:
+                first_start_ms = caption.start_ms
+            last_end_ms = caption.end_ms
+            cue_count += 1
+            for speaker, text in _extract_speaker_fragments(caption.raw_text):
+                if speaker and text and speaker not in participants:
+                    if self.filler_filter is None or self.filler_filter.clean(text):
+                        participants.add(speaker)
+        return cue_count, first_start_ms, last_end_ms, sorted(participants)
 
-        merged_captions = self._merge_captions()
-        
-        # --- Metadata ---
-        title = self.file_path.stem
-        participants = sorted(list(set(c['speaker'] for c in merged_captions)))
-        
-        if not self.captions:
-            duration_minutes = 0
-        else:
-            start_time_str = self.captions[0].start
-            end_time_str = self.captions[-1].end
-            start_time = datetime.strptime(start_time_str.split('.')[0], '%H:%M:%S')
-            end_time = datetime.strptime(end_time_str.split('.')[0], '%H:%M:%S')
-            duration_seconds = (end_time - start_time).total_seconds()
-            duration_minutes = round(duration_seconds / 60) if duration_seconds > 0 else 0
+    def _scan_in_parallel(self):
+        from vtt2md.parallel import merge_in_parallel
+        started = time.perf_counter()
+        merged = merge_in_parallel(self.vtt_content, self.workers, self.merge_threshold_seconds,
+                                   self.filler_filter, cancel_event=self.cancel_event)
+        if merged is None:
+            return None
+        if self.stats is not None:
+            self.stats.stages['scan'].inclusive_seconds += time.perf_counter() - started
+            self.stats.stages['scan'].items += merged.cue_count
+        if self.progress_callback is not None:
+            self.progress_callback('scan', merged.cue_count, merged.cue_count)
+        self._segment_turns = merged.turns
+        self.speakers = merged.speakers
+        # The merge sees exactly the speakers the sequential pre-scan would list
+        return merged.cue_count, merged.first_start_ms, merged.last_end_ms, sorted(merged.speakers.names)
 
+    def _date_str(self) -> str:
+        if self.meeting_datetime:
+            return self.meeting_datetime.strftime('%Y年%m月%d日 %H:%M')
         # Get file modification date
         file_mod_timestamp = os.path.getmtime(self.file_path)
-        file_mod_date = datetime.fromtimestamp(file_mod_timestamp).strftime('%Y年%m月%d日')
+        return datetime.fromtimestamp(file_mod_timestamp).strftime('%Y年%m月%d日')
+
+    def _render_compact_header(self, part_number: int) -> str:
+        return f"# {self.file_path.stem} ({part_number})\n\n**日時:** {self._date_str()}\n\n## 発言記録\n"
+
+    def _render_header(self, first_start_ms: int, last_end_ms: int, participants: list) -> str:
+        # --- Metadata ---
+        title = self.file_path.stem
+
+        duration_ms = last_end_ms - first_start_ms
+        duration_minutes = round(duration_ms / 60000) if duration_ms > 0 else 0
 
-        # --- Build Markdown ---
         md_parts = [
             f"# {title}\n",
-            f"**日時:** {file_mod_date}",
+            f"**日時:** {self._date_str()}",
             "**参加者:**",
         ]
         md_parts.extend([f"- {p}" for p in participants])
         md_parts.append(f"\n**所要時間:** {duration_minutes}分\n")
         md_parts.append("## 発言記録\n")
-
-        for entry in merged_captions:
-            timestamp_str = entry['start'].split('.')[0]
-            md_parts.append(f"**{entry['speaker']}** [{timestamp_str}]  ")
-            md_parts.append(f"{entry['text']}\n")
-            
         return "\n".join(md_parts)
 
-def convert_vtt_to_md(vtt_content: str, file_path: str) -> str:
+    def _track(self, chunks):
+        if self.stats is not None:
+            return self.stats.track_output(chunks)
+        return chunks
+
+    def iter_markdown(self):
+        """
+        Yield the Markdown document chunk by chunk: the header first, then
+        one chunk per merged speaker turn as it comes out of the merger.
+        """
+        return self._track(self._iter_markdown())
+
+    def _iter_markdown(self):
+        cue_count, first_start_ms, last_end_ms, participants = self._scan()
+        self.cue_count = cue_count
+        if not cue_count:
+            yield "# Conversion Error\n\nCould not find any captions in the VTT file."
+            return
+
+        yield self._render_header(first_start_ms, last_end_ms, participants)
+        for turn in self._iter_merged_captions():
+            yield _render_turn(turn.speaker, turn.start_ms, turn.text)
+        if self.speaker_stats:
+            yield _render_speaker_stats(self.speakers)
+
+    def iter_markdown_parts(self, max_chars: int = DEFAULT_SPLIT_MAX_CHARS):
+        """
+        Yield the Markdown document as parts of at most ``max_chars`` characters.
+
+        Parts are filled in a single streaming pass and only cut between
+        speaker turns. The first part starts with the full header and every
+        following part with a compact one. A turn that would not fit even in
+        an otherwise empty part is split at sentence ends (or, failing that,
+        whitespace or a hard cut) and continued under the same speaker line.
+        A document that fits in ``max_chars`` is yielded unchanged as one part.
+        """
+        return self._track(self._iter_markdown_parts(max_chars))
+
+    def _iter_markdown_parts(self, max_chars: int):
+        chunks = self._iter_markdown()
+        header = next(chunks)
+        if not self.cue_count:
+            yield header
+            return
+        if len(header) > max_chars:
+            raise ValueError(f"max_chars={max_chars} is too small for the document header")
+
+        part_number = 1
+        part = [header]
+        size = len(header)
+        for turn in self._iter_merged_captions():
+            chunk = _render_turn(turn.speaker, turn.start_ms, turn.text)
+            if size + len(chunk) <= max_chars:
+                part.append(chunk)
+                size += len(chunk)
+                continue
+
+            if len(part) > 1:
+                yield ''.join(part)
+                part_number += 1
+                part = [self._render_compact_header(part_number)]
+                size = len(part[0])
+                if size + len(chunk) <= max_chars:
+                    part.append(chunk)
+                    size += len(chunk)
+                    continue
+
+            # The turn alone overflows a part: continue it across parts
+            overhead = len(_render_turn(turn.speaker, turn.start_ms, ''))
+            compact_size = len(self._render_compact_header(part_number + 1))
+            if max_chars - max(size, compact_size) - overhead < 1:
+                raise ValueError(f"max_chars={max_chars} is too small to fit a single speaker line")
+            text = turn.text
+            while text:
+                piece, text = _split_text(text, max_chars - size - overhead)
+                part.append(_render_turn(turn.speaker, turn.start_ms, piece))
+                size += overhead + len(piece)
+                if text:
+                    yield ''.join(part)
+                    part_number += 1
+                    part = [self._render_compact_header(part_number)]
+                    size = len(part[0])
+
+        if self.speaker_stats:
+            chunk = _render_speaker_stats(self.speakers)
+            if size + len(chunk) > max_chars:
+                yield ''.join(part)
+                part_number += 1
+                part = [self._render_compact_header(part_number)]
+                if len(part[0]) + len(chunk) > max_chars:
+                    raise ValueError(f"max_chars={max_chars} is too small for the speaker statistics")
+            part.append(chunk)
+        yield ''.join(part)
+
+    def iter_rendered(self, renderer: Renderer):
+        """
+        Yield the document in a structured format (see :mod:`vtt2md.renderers`):
+        the renderer's header, then one chunk per merged speaker turn.
+        Unlike the Markdown output, a transcript without captions raises
+        ``ValueError``.
+        """
+        return self._track(self._iter_rendered(renderer))
+
+    def _iter_rendered(self, renderer: Renderer):
+        cue_count, first_start_ms, last_end_ms, participants = self._scan()
+        self.cue_count = cue_count
+        if not cue_count:
+            raise ValueError("Could not find any captions in the VTT file.")
+
+        yield renderer.header(Document(self.file_path.stem, participants, first_start_ms, last_end_ms, cue_count))
+        for turn in self._iter_merged_captions():
+            yield renderer.turn(turn)
+
+    def write_rendered(self, out, renderer: Renderer) -> None:
+        """Stream the document rendered by ``renderer`` into the writable text file ``out``."""
+        for chunk in self.iter_rendered(renderer):
+            out.write(chunk)
+
+    def write_markdown(self, out) -> None:
+        """Stream the Markdown document into the writable text file ``out``."""
+        for chunk in self.iter_markdown():
+            out.write(chunk)
+
+    def to_markdown(self) -> str:
+        return "".join(self.iter_markdown())
+
+def convert_vtt_to_md(vtt_content: str, file_path: str, meeting_datetime: str | None = None,
+                      remove_fillers: bool = False, split_output: bool = False,
+                      max_chars: int = DEFAULT_SPLIT_MAX_CHARS, stats: ConversionStats | None = None,
+                      speaker_stats: bool = False):
     """
     High-level function to convert VTT content to a formatted Markdown string.
+
+    With ``split_output`` a list of parts of at most ``max_chars`` characters
+    is returned instead (see :meth:`VttConverter.iter_markdown_parts`).
+    Pass a :class:`~vtt2md.profiling.ConversionStats` as ``stats`` to record
+    per-stage timings. ``speaker_stats`` appends the "発言統計" section.
     """
     try:
-        converter = VttConverter(vtt_content, file_path)
+        converter = VttConverter(vtt_content, file_path, meeting_datetime=meeting_datetime,
+                                 remove_fillers=remove_fillers, stats=stats, speaker_stats=speaker_stats)
+        if split_output:
+            return list(converter.iter_markdown_parts(max_chars))
         return converter.to_markdown()
     except Exception as e:
-        return f"# Conversion Error\n\nAn unexpected error occurred: {e}"
\ No newline at end of file
+        error = f"# Conversion Error\n\nAn unexpected error occurred: {e}"
+        return [error] if split_output else error
+
+def stream_vtt_to_md(vtt_source, file_path: str, out=None, meeting_datetime: str | None = None,
+                     remove_fillers: bool = False, stats: ConversionStats | None = None,
+                     speaker_stats: bool = False):
+    """
+    Streaming variant of :func:`convert_vtt_to_md` for large transcripts.
+
+    ``vtt_source`` may be VTT text, a path or a seekable text file. When
+    ``out`` is given the Markdown is written into it chunk by chunk;
+    otherwise an iterator over the chunks is returned. Unlike
+    :func:`convert_vtt_to_md`, errors are raised rather than rendered.
+    """
+    converter = VttConverter(vtt_source, file_path, meeting_datetime=meeting_datetime,
+                             remove_fillers=remove_fillers, stats=stats, speaker_stats=speaker_stats)
+    if out is None:
+        return converter.iter_markdown()
+    converter.write_markdown(out)
+    return None
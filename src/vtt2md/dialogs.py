@@ -0,0 +1,77 @@
+"""
+会議日時の入力ダイアログ。
+
+tkcalendar の読み込みには時間がかかるため、main.py からは初めてダイアログを
+開くときに読み込む。
+"""
+from datetime import datetime
+
+import customtkinter
+from tkcalendar import DateEntry
+
+# --- カスタムダイアログ --- #
+class DateTimeDialog(customtkinter.CTkToplevel):
+    """日付と時刻を同時に入力するためのカスタムダイアログ。"""
+    def __init__(self, master=None):
+        super().__init__(master)
+
+        self.title("会議の日時を入力")
+        self.lift()
+        self.attributes("-topmost", True)
+        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
+
+        self._date_str = None
+        self._time_str = None
+
+        # Define a larger, consistent font
+        entry_font = ("Yu Gothic UI", 16)
+
+        main_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        main_frame.pack(expand=True, fill="both", padx=20, pady=20)
+
+        # Date Entry (tkcalendarを使用)
+        customtkinter.CTkLabel(main_frame, text="会議の日付", font=("Yu Gothic UI", 13)).pack(anchor="w")
+        self.date_entry = DateEntry(main_frame, date_pattern='y-mm-dd', width=18,
+                                    background='#3B8ED0', foreground='white', borderwidth=2, 
+                                    font=entry_font) # Apply font
+        self.date_entry.pack(pady=(5, 15), fill="x", ipady=4) # Add internal padding
+
+        # Time Entry
+        customtkinter.CTkLabel(main_frame, text="会議の開始時刻 (HH:MM)", font=("Yu Gothic UI", 13)).pack(anchor="w")
+        self.time_entry = customtkinter.CTkEntry(main_frame, placeholder_text="14:30", width=250, font=entry_font) # Apply font
+        self.time_entry.pack(pady=(5, 20), fill="x", ipady=4) # Add internal padding
+        self.time_entry.insert(0, datetime.now().strftime("%H:%M"))
+
+        # Buttons
+        button_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        button_frame.pack(pady=(10, 15))
+
+        self.ok_button = customtkinter.CTkButton(button_frame, text="OK", command=self._on_ok, width=100)
+        self.ok_button.pack(side="left", padx=10)
+
+        self.cancel_button = customtkinter.CTkButton(button_frame, text="キャンセル", command=self._on_cancel, fg_color="gray50", hover_color="gray40", width=100)
+        self.cancel_button.pack(side="left", padx=10)
+        
+        self.time_entry.focus_set()
+
+        # ウィンドウが表示される前にレイアウトを強制的に更新
+        self.update_idletasks()
+        # grab_set() はサイズ計算の後に呼び出す
+        self.grab_set()
+
+    def _on_ok(self, event=None):
+        self._date_str = self.date_entry.get().strip()
+        self._time_str = self.time_entry.get().strip()
+        self.grab_release()
+        self.destroy()
+
+    def _on_cancel(self):
+        self._date_str = None
+        self._time_str = None
+        self.grab_release()
+        self.destroy()
+
+    def get_input(self) -> tuple[str | None, str | None]:
+        """ダイアログをモーダルで表示し、入力値を返す。"""
+        self.master.wait_window(self)
+        return self._date_str, self._time_str
@@ -0,0 +1,87 @@
+"""
+Filler and backchannel removal.
+
+Fillers (えー, あのー, um, ...) are removed from inside a cue when they stand
+on their own between delimiters, so "あの人" is left alone but "あの、" is
+dropped. Cues that are nothing but backchannel (うん, はい, yeah, ...) once
+fillers are gone are removed entirely before merging. Each word list is
+compiled into a single alternation, built once per process and shared.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_FILLERS = (
+    # Japanese
+    'えーっと', 'えーと', 'ええと', 'えっと', 'えと', 'えー', 'えぇ', 'あのー', 'あのう', 'あの',
+    'そのー', 'まあ', 'まぁ', 'うーん', 'うーむ', 'んー', 'あー',
+    # English
+    'um', 'umm', 'uh', 'uhh', 'er', 'erm', 'hmm', 'mm', 'ah',
+)
+DEFAULT_BACKCHANNELS = (
+    # Japanese
+    'はい', 'うん', 'ええ', 'ああ', 'へえ', 'へー', 'ふーん', 'そうですね', 'そうそう', 'そうか', 'なるほど', 'たしかに',
+    # English
+    'yeah', 'yes', 'yep', 'ok', 'okay', 'right', 'sure', 'uh-huh', 'mm-hmm', 'i see',
+)
+
+# Characters that delimit a filler: whitespace and Japanese/ASCII punctuation
+_DELIMITERS = r'\s、。，．,.!?！？…・「」『』（）()'
+_PUNCTUATION = ' \t\n、。，．,.!?！？…・「」『』（）()'
+# Fillers and backchannels are often drawn out: "えーー", "うーん〜"
+_ELONGATION = '[ー〜~]*'
+
+
+def _alternation(words) -> str:
+    # Longest first so "えーっと" wins over "えー"
+    return '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+@lru_cache(maxsize=None)
+def _compile_filler_re(fillers: tuple):
+    return re.compile(
+        rf'(?<![^{_DELIMITERS}])(?:{_alternation(fillers)}){_ELONGATION}(?=[{_DELIMITERS}]|$)[、，,]?[ \t]*',
+        re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _compile_backchannel_re(backchannels: tuple):
+    return re.compile(rf'(?:(?:{_alternation(backchannels)}){_ELONGATION}[{_DELIMITERS}]*)+', re.IGNORECASE)
+
+
+def load_word_list(path) -> list[str]:
+    """
+    Read a word list file: one word per line. Markdown list markers and
+    blank, ``#`` heading or comment lines are ignored.
+    """
+    words = []
+    with open(Path(path), 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            word = line.strip().lstrip('-*').strip()
+            if word and not word.startswith('#'):
+                words.append(word)
+    return words
+
+
+class FillerFilter:
+    def __init__(self, fillers=DEFAULT_FILLERS, backchannels=DEFAULT_BACKCHANNELS):
+        self.fillers = tuple(fillers)
+        self.backchannels = tuple(backchannels)
+        self._filler_re = _compile_filler_re(self.fillers) if self.fillers else None
+        self._backchannel_re = _compile_backchannel_re(self.backchannels) if self.backchannels else None
+
+    def clean(self, text: str) -> str:
+        """Return ``text`` without fillers, or an empty string for a pure backchannel cue."""
+        if self._filler_re is not None:
+            text = self._filler_re.sub('', text).strip()
+        if not text.strip(_PUNCTUATION):
+            return ''
+        if self._backchannel_re is not None and self._backchannel_re.fullmatch(text):
+            return ''
+        return text
+
+
+@lru_cache(maxsize=None)
+def default_filler_filter() -> FillerFilter:
+    """Process-wide filter for the default word lists."""
+    return FillerFilter()
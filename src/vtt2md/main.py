@@ -1,80 +1,29 @@
 import customtkinter
 from tkinterdnd2 import TkinterDnD, DND_FILES
 from pathlib import Path
+import os
+import queue
 import threading
 from tkinter import filedialog, messagebox
-from vtt2md.converter import convert_vtt_to_md
 from datetime import datetime
-from tkcalendar import DateEntry
-
-# --- カスタムダイアログ --- #
-class DateTimeDialog(customtkinter.CTkToplevel):
-    """日付と時刻を同時に入力するためのカスタムダイアログ。"""
-    def __init__(self, master=None):
-        super().__init__(master)
-
-        self.title("会議の日時を入力")
-        self.lift()
-        self.attributes("-topmost", True)
-        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
-
-        self._date_str = None
-        self._time_str = None
-
-        # Define a larger, consistent font
-        entry_font = ("Yu Gothic UI", 16)
-
-        main_frame = customtkinter.CTkFrame(self, fg_color="transparent")
-        main_frame.pack(expand=True, fill="both", padx=20, pady=20)
-
-        # Date Entry (tkcalendarを使用)
-        customtkinter.CTkLabel(main_frame, text="会議の日付", font=("Yu Gothic UI", 13)).pack(anchor="w")
-        self.date_entry = DateEntry(main_frame, date_pattern='y-mm-dd', width=18,
-                                    background='#3B8ED0', foreground='white', borderwidth=2, 
-                                    font=entry_font) # Apply font
-        self.date_entry.pack(pady=(5, 15), fill="x", ipady=4) # Add internal padding
-
-        # Time Entry
-        customtkinter.CTkLabel(main_frame, text="会議の開始時刻 (HH:MM)", font=("Yu Gothic UI", 13)).pack(anchor="w")
-        self.time_entry = customtkinter.CTkEntry(main_frame, placeholder_text="14:30", width=250, font=entry_font) # Apply font
-        self.time_entry.pack(pady=(5, 20), fill="x", ipady=4) # Add internal padding
-        self.time_entry.insert(0, datetime.now().strftime("%H:%M"))
-
-        # Buttons
-        button_frame = customtkinter.CTkFrame(self, fg_color="transparent")
-        button_frame.pack(pady=(10, 15))
-
-        self.ok_button = customtkinter.CTkButton(button_frame, text="OK", command=self._on_ok, width=100)
-        self.ok_button.pack(side="left", padx=10)
-
-        self.cancel_button = customtkinter.CTkButton(button_frame, text="キャンセル", command=self._on_cancel, fg_color="gray50", hover_color="gray40", width=100)
-        self.cancel_button.pack(side="left", padx=10)
-        
-        self.time_entry.focus_set()
-
-        # ウィンドウが表示される前にレイアウトを強制的に更新
-        self.update_idletasks()
-        # grab_set() はサイズ計算の後に呼び出す
-        self.grab_set()
-
-    def _on_ok(self, event=None):
-        self._date_str = self.date_entry.get().strip()
-        self._time_str = self.time_entry.get().strip()
-        self.grab_release()
-        self.destroy()
-
-    def _on_cancel(self):
-        self._date_str = None
-        self._time_str = None
-        self.grab_release()
-        self.destroy()
-
-    def get_input(self) -> tuple[str | None, str | None]:
-        """ダイアログをモーダルで表示し、入力値を返す。"""
-        self.master.wait_window(self)
-        return self._date_str, self._time_str
-
-# --- メインアプリケーション (以下は変更なし) --- #
+
+# 起動を速くするため、ウィンドウ表示に不要なモジュール (変換処理・tkcalendar・multiprocessing) は
+# 初めて使うときに読み込む。変換処理はウィンドウ表示後にバックグラウンドで先読みする。
+
+# 変換スレッドからの通知をTkのメインループで確認する間隔 (ms)
+QUEUE_POLL_INTERVAL_MS = 100
+# 複数ファイル変換で同時に動かすワーカープロセス数の上限
+MAX_QUEUE_WORKERS = 4
+# プレビューに一度に読み込む文字数。スクロールが末尾に近づくと次を読み込む
+PREVIEW_CHUNK_CHARS = 20000
+# ウィンドウ表示後、変換処理のモジュールを先読みするまでの待ち時間 (ms)
+PRELOAD_DELAY_MS = 500
+
+
+def _preload_converter():
+    import vtt2md.cli  # noqa: F401  (vtt2md.converter も読み込まれる)
+
+# --- メインアプリケーション --- #
 class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
     def __init__(self):
         super().__init__()
@@ -86,13 +35,24 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         self.file_path = None
         self.md_content = []
         self.meeting_datetime = None
+        # 変換スレッド -> Tk への通知キュー (Tkウィジェットはメインスレッドからのみ操作する)
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.preview_text = None
+        self.preview_offset = 0
+        # 複数ファイル変換のジョブ: {"path", "datetime_var", "status_label"}
+        self.jobs = []
+        self.executor = None
+        self._pending_jobs = 0
         self.remove_fillers_var = customtkinter.BooleanVar(value=True)
+        self.speaker_stats_var = customtkinter.BooleanVar(value=False)
         self.split_files_var = customtkinter.StringVar(value="single")
         self.main_frame = customtkinter.CTkFrame(self, corner_radius=0, fg_color="transparent")
         self.main_frame.pack(expand=True, fill=customtkinter.BOTH, padx=20, pady=(20, 0))
         self.status_label = customtkinter.CTkLabel(self, text="ステータス: 待機中", font=("Yu Gothic UI", 12))
         self.status_label.pack(side=customtkinter.BOTTOM, fill=customtkinter.X, padx=20, pady=(0, 10))
         self.create_initial_view()
+        self.after(PRELOAD_DELAY_MS, lambda: threading.Thread(target=_preload_converter, daemon=True).start())
 
     def create_initial_view(self):
         self._clear_frame()
@@ -111,6 +71,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         options_frame.columnconfigure(0, weight=1)
         options_frame.columnconfigure(1, weight=1)
         customtkinter.CTkSwitch(options_frame, text="フィラー・相槌を除去する", variable=self.remove_fillers_var, font=("Yu Gothic UI", 13)).grid(row=0, column=0, sticky="w", padx=10)
+        customtkinter.CTkSwitch(options_frame, text="発言統計を追加する", variable=self.speaker_stats_var, font=("Yu Gothic UI", 13)).grid(row=0, column=1, sticky="w", padx=10)
         output_format_frame = customtkinter.CTkFrame(options_frame)
         output_format_frame.grid(row=1, column=0, columnspan=2, sticky="w", padx=10, pady=(10,0))
         customtkinter.CTkLabel(output_format_frame, text="出力形式:", font=("Yu Gothic UI", 13)).pack(side="left", padx=(0, 10))
@@ -129,29 +90,218 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         customtkinter.CTkLabel(self.main_frame, text="✓ 変換完了", font=("Yu Gothic UI", 24, "bold"), text_color="#10B981").pack(pady=(0, 30))
         text_frame = customtkinter.CTkFrame(self.main_frame, corner_radius=10)
         text_frame.pack(expand=True, fill=customtkinter.BOTH, pady=10)
-        preview_text = customtkinter.CTkTextbox(text_frame, wrap="word", font=("Yu Gothic", 12), activate_scrollbars=True)
-        if self.md_content:
-            preview_text.insert("end", self.md_content[0])
-        preview_text.configure(state="disabled")
-        preview_text.pack(expand=True, fill=customtkinter.BOTH, padx=10, pady=10)
+        self.preview_text = customtkinter.CTkTextbox(text_frame, wrap="word", font=("Yu Gothic", 12), activate_scrollbars=True)
+        self.preview_text.configure(state="disabled")
+        self.preview_text.pack(expand=True, fill=customtkinter.BOTH, padx=10, pady=10)
+        # 大きな出力でTkが固まらないよう、プレビューは少しずつ読み込む
+        self.preview_offset = 0
+        self._load_more_preview()
         button_frame = customtkinter.CTkFrame(self.main_frame, fg_color="transparent")
         button_frame.pack(pady=20)
         customtkinter.CTkButton(button_frame, text="💾 ダウンロード", command=self.download_file, font=("Yu Gothic UI", 14, "bold"), height=40).pack(side=customtkinter.LEFT, padx=10)
         customtkinter.CTkButton(button_frame, text="🔄 新規変換", command=self.create_initial_view, font=("Yu Gothic UI", 14, "bold"), height=40).pack(side=customtkinter.LEFT, padx=10)
 
+    def _load_more_preview(self):
+        preview_text = self.preview_text
+        if preview_text is None or not preview_text.winfo_exists() or not self.md_content:
+            return
+        content = self.md_content[0]
+        if self.preview_offset == 0 or preview_text.yview()[1] > 0.9:
+            chunk = content[self.preview_offset:self.preview_offset + PREVIEW_CHUNK_CHARS]
+            preview_text.configure(state="normal")
+            preview_text.insert("end", chunk)
+            preview_text.configure(state="disabled")
+            self.preview_offset += len(chunk)
+        if self.preview_offset < len(content):
+            self.after(200, self._load_more_preview)
+
+    def create_progress_view(self):
+        self._clear_frame()
+        customtkinter.CTkLabel(self.main_frame, text="変換中...", font=("Yu Gothic UI", 24, "bold")).pack(pady=(0, 30))
+        customtkinter.CTkLabel(self.main_frame, text=self.file_path.name, font=("Yu Gothic UI", 13)).pack(pady=(0, 10))
+        self.progress_bar = customtkinter.CTkProgressBar(self.main_frame, mode="indeterminate")
+        self.progress_bar.pack(fill="x", padx=20, pady=10)
+        self.progress_bar.start()
+        self.progress_label = customtkinter.CTkLabel(self.main_frame, text="ファイルを解析しています...", font=("Yu Gothic UI", 12))
+        self.progress_label.pack(pady=(0, 20))
+        self.cancel_button = customtkinter.CTkButton(self.main_frame, text="キャンセル", command=self.cancel_conversion, fg_color="gray50", hover_color="gray40", font=("Yu Gothic UI", 14, "bold"), height=40)
+        self.cancel_button.pack(pady=10)
+
+    def cancel_conversion(self):
+        self.cancel_event.set()
+        self.cancel_button.configure(state="disabled", text="キャンセル中...")
+
+    def _show_progress(self, stage, done, total):
+        if stage == "scan" or not total:
+            self.progress_label.configure(text=f"ファイルを解析しています... ({done:,} 件)")
+            return
+        if self.progress_bar.cget("mode") != "determinate":
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+        self.progress_bar.set(done / total)
+        self.progress_label.configure(text=f"{done:,} / {total:,} 件を変換しました")
+
+    def _poll_events(self):
+        """変換スレッドからの通知を処理する。変換が終わるまで自身を再スケジュールする。"""
+        try:
+            while True:
+                kind, *payload = self.events.get_nowait()
+                if kind == "progress":
+                    self._show_progress(*payload)
+                    continue
+                self.status_label.configure(text="ステータス: 待機中")
+                if kind == "done":
+                    self.md_content = payload[0]
+                    self.create_result_view()
+                elif kind == "cancelled":
+                    self.create_initial_view()
+                    self.status_label.configure(text="ステータス: 変換をキャンセルしました")
+                else:
+                    self.create_initial_view()
+                    messagebox.showerror(*payload)
+                return
+        except queue.Empty:
+            pass
+        self.after(QUEUE_POLL_INTERVAL_MS, self._poll_events)
+
     def drop_file(self, event):
         self.on_drag_leave(event)
-        filepath = event.data
-        if filepath.startswith('{') and filepath.endswith('}'):
-            filepath = filepath[1:-1]
-        self.process_file(filepath)
+        # tkdnd はスペースを含むパスを {} で囲んだTclリストで渡すため、splitlistで分解する
+        self.process_files(self.tk.splitlist(event.data))
 
     def select_file(self):
-        filepath = filedialog.askopenfilename(filetypes=[("VTT Files", "*.vtt")])
-        if filepath:
-            self.process_file(filepath)
+        filepaths = filedialog.askopenfilenames(filetypes=[("VTT Files", "*.vtt")])
+        if filepaths:
+            self.process_files(filepaths)
+
+    def process_files(self, filepaths):
+        """1ファイルなら従来の単一変換、複数ならジョブキューに追加する。"""
+        vtt_paths = [Path(p) for p in filepaths if Path(p).suffix.lower() == '.vtt']
+        if not vtt_paths:
+            messagebox.showerror("エラー", "VTTファイルを選択してください。")
+            return
+        if len(filepaths) == 1 and not self.jobs:
+            self.process_file(filepaths[0])
+            return
+        self.enqueue_files(vtt_paths)
+
+    # --- 複数ファイルのジョブキュー --- #
+    def enqueue_files(self, vtt_paths):
+        if self._pending_jobs:
+            messagebox.showinfo("変換中", "現在のキューの変換が終わってから追加してください。")
+            return
+        if not self.jobs or self.executor is not None:
+            self.jobs = []
+            self.create_queue_view()
+        known = {job["path"] for job in self.jobs}
+        for vtt_path in vtt_paths:
+            if vtt_path not in known:
+                self._add_job_row(vtt_path)
+
+    def create_queue_view(self):
+        self._clear_frame()
+        self.executor = None
+        customtkinter.CTkLabel(self.main_frame, text="変換キュー", font=("Yu Gothic UI", 24, "bold")).pack(pady=(0, 10))
+        customtkinter.CTkLabel(self.main_frame, text="会議日時はファイルから推定しています。必要に応じて修正してください (YYYY-MM-DD HH:MM)。", font=("Yu Gothic UI", 12), wraplength=520).pack(pady=(0, 10))
+        self.queue_frame = customtkinter.CTkScrollableFrame(self.main_frame, corner_radius=10)
+        self.queue_frame.pack(expand=True, fill=customtkinter.BOTH, pady=10)
+        self.queue_frame.columnconfigure(0, weight=1)
+        # キュー表示中もファイルを追加でドロップできる
+        self.queue_frame.drop_target_register(DND_FILES)
+        self.queue_frame.dnd_bind('<<Drop>>', lambda event: self.process_files(self.tk.splitlist(event.data)))
+        button_frame = customtkinter.CTkFrame(self.main_frame, fg_color="transparent")
+        button_frame.pack(pady=20)
+        self.start_queue_button = customtkinter.CTkButton(button_frame, text="保存先を選択して変換開始", command=self.start_queue, font=("Yu Gothic UI", 14, "bold"), height=40)
+        self.start_queue_button.pack(side=customtkinter.LEFT, padx=10)
+        customtkinter.CTkButton(button_frame, text="🔄 新規変換", command=self._reset_queue, font=("Yu Gothic UI", 14, "bold"), height=40).pack(side=customtkinter.LEFT, padx=10)
+
+    def _add_job_row(self, vtt_path):
+        from vtt2md.converter import guess_meeting_datetime
+        row = len(self.jobs)
+        customtkinter.CTkLabel(self.queue_frame, text=vtt_path.name, font=("Yu Gothic UI", 12), anchor="w").grid(row=row, column=0, sticky="we", padx=5, pady=2)
+        datetime_var = customtkinter.StringVar(value=guess_meeting_datetime(vtt_path))
+        customtkinter.CTkEntry(self.queue_frame, textvariable=datetime_var, width=140, font=("Yu Gothic UI", 12)).grid(row=row, column=1, padx=5, pady=2)
+        status_label = customtkinter.CTkLabel(self.queue_frame, text="待機中", font=("Yu Gothic UI", 12), width=90)
+        status_label.grid(row=row, column=2, padx=5, pady=2)
+        self.jobs.append({"path": vtt_path, "datetime_var": datetime_var, "status_label": status_label})
+
+    def start_queue(self):
+        from concurrent.futures import ProcessPoolExecutor
+        from vtt2md.cli import collision_error, convert_file, output_collisions, output_path_for
+        from vtt2md.converter import DEFAULT_SPLIT_MAX_CHARS
+        for job in self.jobs:
+            try:
+                datetime.strptime(job["datetime_var"].get().strip(), "%Y-%m-%d %H:%M")
+            except ValueError:
+                messagebox.showerror("エラー", f"{job['path'].name} の日時の形式が不正です。YYYY-MM-DD HH:MM形式で入力してください。")
+                return
+        output_dir = filedialog.askdirectory(title="保存先フォルダを選択してください")
+        if not output_dir:
+            return
+        self.start_queue_button.configure(state="disabled")
+        split_max_chars = DEFAULT_SPLIT_MAX_CHARS if self.split_files_var.get() == "split" else None
+        md_paths = [output_path_for(job["path"], Path(output_dir), split=bool(split_max_chars)) for job in self.jobs]
+        # 別フォルダの同名ファイルは同じ出力先を上書きし合うため、変換せずにエラーにする
+        collisions = output_collisions((job["path"], md_path) for job, md_path in zip(self.jobs, md_paths))
+        self.events = queue.Queue()
+        workers = max(min(MAX_QUEUE_WORKERS, os.cpu_count() or 1, len(self.jobs) - len(collisions)), 1)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.status_label.configure(text=f"ステータス: {len(self.jobs) - len(collisions)}件を変換中...")
+        for index, (job, md_path) in enumerate(zip(self.jobs, md_paths)):
+            if job["path"] in collisions:
+                job["error"] = collision_error(md_path, collisions[job["path"]])
+                job["status_label"].configure(text="エラー", text_color="#DC2626")
+                continue
+            metadata = {
+                "meeting_datetime": job["datetime_var"].get().strip(),
+                "remove_fillers": self.remove_fillers_var.get(),
+                "speaker_stats": self.speaker_stats_var.get(),
+                "split_max_chars": split_max_chars,
+            }
+            job["status_label"].configure(text="変換中...")
+            future = self.executor.submit(convert_file, job["path"], md_path, metadata)
+            # 完了コールバックはエグゼキューターのスレッドで呼ばれるので、キュー経由でTkに渡す
+            future.add_done_callback(lambda f, index=index: self.events.put(("job", index, f)))
+        self.executor.shutdown(wait=False)
+        self._pending_jobs = len(self.jobs) - len(collisions)
+        self.after(QUEUE_POLL_INTERVAL_MS, self._poll_queue_events)
+
+    def _poll_queue_events(self):
+        try:
+            while True:
+                _, index, future = self.events.get_nowait()
+                status_label = self.jobs[index]["status_label"]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": str(e)}
+                if result["error"]:
+                    status_label.configure(text="エラー", text_color="#DC2626")
+                    self.jobs[index]["error"] = result["error"]
+                else:
+                    status_label.configure(text="✓ 完了", text_color="#10B981")
+                self._pending_jobs -= 1
+        except queue.Empty:
+            pass
+        if self._pending_jobs > 0:
+            self.after(QUEUE_POLL_INTERVAL_MS, self._poll_queue_events)
+            return
+        failed = [job for job in self.jobs if job.get("error")]
+        self.status_label.configure(text=f"ステータス: {len(self.jobs) - len(failed)}件完了 / {len(failed)}件エラー")
+        if failed:
+            messagebox.showerror("変換エラー", "\n".join(f"{job['path'].name}: {job['error']}" for job in failed))
+
+    def _reset_queue(self):
+        if self._pending_jobs:
+            messagebox.showinfo("変換中", "現在のキューの変換が終わるまでお待ちください。")
+            return
+        self.jobs = []
+        self.executor = None
+        self.status_label.configure(text="ステータス: 待機中")
+        self.create_initial_view()
 
     def _get_meeting_datetime(self) -> str | None:
+        from vtt2md.dialogs import DateTimeDialog
         dialog = DateTimeDialog(self)
         date_str, time_str = dialog.get_input()
         if not date_str or not time_str:
@@ -178,26 +328,44 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         if not self.meeting_datetime:
             return
         self.status_label.configure(text="ステータス: 変換中...")
-        threading.Thread(target=self._run_conversion, daemon=True).start()
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.create_progress_view()
+        # Tk変数はメインスレッドで読み取ってからワーカーに渡す
+        options = {
+            "meeting_datetime": self.meeting_datetime,
+            "remove_fillers": self.remove_fillers_var.get(),
+            "speaker_stats": self.speaker_stats_var.get(),
+        }
+        split_output = self.split_files_var.get() == "split"
+        threading.Thread(target=self._run_conversion, args=(self.file_path, options, split_output,
+                                                             self.events, self.cancel_event), daemon=True).start()
+        self.after(QUEUE_POLL_INTERVAL_MS, self._poll_events)
 
-    def _run_conversion(self):
+    @staticmethod
+    def _run_conversion(file_path, options, split_output, events, cancel_event):
+        """ワーカースレッドで実行する。結果や進捗はすべて events キュー経由で通知する。"""
+        from vtt2md.converter import VttConverter, ConversionCancelled
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-            self.md_content = convert_vtt_to_md(
-                vtt_content,
-                str(self.file_path),
-                meeting_datetime=self.meeting_datetime,
-                remove_fillers=self.remove_fillers_var.get(),
-                split_output=(self.split_files_var.get() == "split")
+            # ファイル全体を読み込まず、パスからストリーミングで変換する
+            converter = VttConverter(
+                file_path,
+                str(file_path),
+                progress_callback=lambda stage, done, total: events.put(("progress", stage, done, total)),
+                cancel_event=cancel_event,
+                **options
             )
-            self.after(0, self.create_result_view)
+            if split_output:
+                md_content = list(converter.iter_markdown_parts())
+            else:
+                md_content = [converter.to_markdown()]
+            events.put(("done", md_content))
+        except ConversionCancelled:
+            events.put(("cancelled",))
         except FileNotFoundError:
-            self.after(0, lambda: messagebox.showerror("エラー", "ファイルが見つかりません。"))
+            events.put(("error", "エラー", "ファイルが見つかりません。"))
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror("変換エラー", f"予期せぬエラーが発生しました: {e}"))
-        finally:
-            self.after(0, lambda: self.status_label.configure(text="ステータス: 待機中"))
+            events.put(("error", "変換エラー", f"予期せぬエラーが発生しました: {e}"))
 
     def download_file(self):
         if not self.md_content:
@@ -244,5 +412,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             widget.destroy()
 
 if __name__ == "__main__":
+    import multiprocessing
+    # PyInstallerでビルドした実行ファイルからワーカープロセスを起動するために必要
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Parallel parsing and merging of a single large transcript.
+
+The file is cut into byte ranges at blank lines, where the parser starts a
+fresh block anyway. Each range is parsed and merged in its own worker
+process, and the turns are stitched back together at the boundaries with
+the same ``merge_threshold_seconds`` rule as
+:func:`~vtt2md.converter.merge_turns`: the first turn of a segment
+continues the last turn before it when the speaker is the same and the gap
+is within the threshold. Turn texts, speaker ids and per-speaker aggregates
+come out exactly as from the sequential pipeline.
+
+Only encodings in which a newline byte is always a newline (UTF-8, CP932)
+can be cut this way; UTF-16 files and files too small to be worth the
+process start-up are left to the sequential path.
+"""
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from vtt2md.converter import (
+    ConversionCancelled, SpeakerTable, Turn, detect_encoding, iter_cues, merge_turns, _ENCODING_SAMPLE_SIZE,
+)
+
+# Segments smaller than this cost more in process start-up than they save
+MIN_SEGMENT_BYTES = 4 * 1024 * 1024
+# A line holding nothing but whitespace; str.strip() in the parser treats it as blank too
+_BLANK_LINE_RE = re.compile(rb'\n[ \t\r\f\v]*\n')
+_NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+_SEGMENT_HEADER = 'WEBVTT\n\n'
+
+
+class MergedSegments(NamedTuple):
+    cue_count: int
+    first_start_ms: int | None
+    last_end_ms: int | None
+    turns: list
+    speakers: SpeakerTable
+
+
+def plan_segments(path, workers: int, min_segment_bytes: int | None = None):
+    """
+    Return ``(encoding, [(start, end), ...])`` byte ranges for ``path``, or
+    ``None`` when the file should be converted sequentially. Segments are at
+    least ``min_segment_bytes`` (default :data:`MIN_SEGMENT_BYTES`) long.
+    """
+    size = os.path.getsize(path)
+    count = min(workers, size // max(min_segment_bytes or MIN_SEGMENT_BYTES, 1))
+    if count < 2:
+        return None
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        head = mapped[:_ENCODING_SAMPLE_SIZE]
+        if head.isascii():
+            # Detect from the first non-ASCII bytes, as the sequential decoder does
+            match = _NON_ASCII_RE.search(mapped)
+            if match is not None:
+                head = mapped[match.start():match.start() + _ENCODING_SAMPLE_SIZE]
+        encoding = detect_encoding(head)
+        if encoding == 'utf-16':
+            return None
+        bounds = [0]
+        for index in range(1, count):
+            match = _BLANK_LINE_RE.search(mapped, max(size * index // count, bounds[-1]))
+            if match is None:
+                break
+            if match.end() > bounds[-1]:
+                bounds.append(match.end())
+    if bounds[-1] < size:
+        bounds.append(size)
+    if len(bounds) < 3:
+        return None
+    return encoding, list(zip(bounds, bounds[1:]))
+
+
+def merge_segment(path, start: int, end: int, encoding: str, merge_threshold_seconds, filler_filter=None):
+    """Parse and merge one byte range; runs inside a worker process."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if start:
+        # The BOM, if any, is only at the start of the file
+        text = _SEGMENT_HEADER + data.decode('utf-8' if encoding == 'utf-8-sig' else encoding)
+    else:
+        text = data.decode(encoding)
+
+    counts = [0, None, None]
+
+    def counted(cues):
+        for cue in cues:
+            if counts[1] is None:
+                counts[1] = cue.start_ms
+            counts[2] = cue.end_ms
+            counts[0] += 1
+            yield cue
+
+    speakers = SpeakerTable()
+    turns = list(merge_turns(counted(iter_cues(text)), merge_threshold_seconds, filler_filter, speakers))
+    return MergedSegments(counts[0], counts[1], counts[2], turns, speakers)
+
+
+def stitch_segments(segments, merge_threshold_seconds) -> MergedSegments:
+    """Join per-segment results in order, merging turns across segment boundaries."""
+    threshold_ms = merge_threshold_seconds * 1000
+    cue_count = 0
+    first_start_ms = last_end_ms = None
+    turns = []
+    speakers = SpeakerTable()
+    for segment in segments:
+        cue_count += segment.cue_count
+        if segment.cue_count:
+            if first_start_ms is None:
+                first_start_ms = segment.first_start_ms
+            last_end_ms = segment.last_end_ms
+        for index, name in enumerate(segment.speakers.names):
+            speaker_id = speakers.intern(name)
+            speakers.turn_counts[speaker_id] += segment.speakers.turn_counts[index]
+            speakers.talk_ms[speaker_id] += segment.speakers.talk_ms[index]
+            speakers.char_counts[speaker_id] += segment.speakers.char_counts[index]
+        segment_turns = segment.turns
+        if turns and segment_turns:
+            last, first = turns[-1], segment_turns[0]
+            if first.speaker == last.speaker and first.start_ms - last.end_ms <= threshold_ms:
+                turns[-1] = Turn(last.speaker, last.start_ms, first.end_ms, f"{last.text} {first.text}")
+                speakers.turn_counts[speakers.ids[last.speaker]] -= 1
+                segment_turns = segment_turns[1:]
+        # Share one string per speaker across segments, as the sequential merge does
+        turns.extend(turn._replace(speaker=speakers.names[speakers.ids[turn.speaker]]) for turn in segment_turns)
+    return MergedSegments(cue_count, first_start_ms, last_end_ms, turns, speakers)
+
+
+def merge_in_parallel(path, workers: int, merge_threshold_seconds, filler_filter=None,
+                      min_segment_bytes: int | None = None, cancel_event=None) -> MergedSegments | None:
+    """
+    Parse and merge ``path`` on up to ``workers`` processes. Returns ``None``
+    when the file is not worth splitting (see :func:`plan_segments`).
+    """
+    plan = plan_segments(path, workers, min_segment_bytes)
+    if plan is None:
+        return None
+    encoding, ranges = plan
+    segments = []
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(merge_segment, path, start, end, encoding, merge_threshold_seconds, filler_filter)
+                   for start, end in ranges]
+        for future in futures:
+            if cancel_event is not None and cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+                raise ConversionCancelled()
+            segments.append(future.result())
+    return stitch_segments(segments, merge_threshold_seconds)
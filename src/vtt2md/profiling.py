@@ -0,0 +1,206 @@
+"""
+Optional per-stage instrumentation for conversions.
+
+Pass a :class:`ConversionStats` to :class:`~vtt2md.converter.VttConverter`
+(or ``stats=`` of the high-level functions) to record, for each pipeline
+stage, the wall time spent in it and the number of items it produced:
+
+- ``scan``:   header pre-scan (parsing included)
+- ``parse``:  cue parsing for the transcript body
+- ``merge``:  speaker-turn merging (filler removal included)
+- ``render``: Markdown formatting
+- ``write``:  time spent by the consumer writing the chunks out
+
+Generators interleave, so every stage is timed around its own ``next()``
+calls and the time of the stages it pulls from is subtracted. Without a
+stats object none of this wrapping happens. ``tracemalloc`` and
+``cProfile`` are imported only when used, to keep startup cheap.
+
+With ``trace_memory`` the peak traced allocation is recorded for the whole
+conversion and for every stage: the highest total while the stage was
+running, including the stages it pulls from. Segments merged in worker
+processes (``workers`` > 1) are not traced.
+"""
+import time
+from contextlib import contextmanager
+
+STAGES = ('scan', 'parse', 'merge', 'render', 'write')
+
+
+class StageStats:
+    __slots__ = ('name', 'inclusive_seconds', 'items', 'exclusive_of', 'peak_alloc_bytes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.inclusive_seconds = 0.0
+        self.items = 0
+        self.exclusive_of = ()
+        self.peak_alloc_bytes = None
+
+
+class ConversionStats:
+    def __init__(self, trace_memory: bool = False):
+        # trace_memory uses tracemalloc, which slows the conversion down noticeably
+        self.trace_memory = trace_memory
+        self.stages = {name: StageStats(name) for name in STAGES}
+        self.input_size = None  # bytes for paths, characters for str input
+        self.output_bytes = 0  # UTF-8 encoded size of the output
+        self.cue_count = 0
+        self.turn_count = 0
+        self.total_seconds = 0.0
+        self.peak_alloc_bytes = None
+        self._started = None
+        self._owns_tracemalloc = False
+        # The tracemalloc module while tracing, and the stages running right now, innermost last
+        self._tracemalloc = None
+        self._active = []
+
+    def seconds(self, stage: str) -> float:
+        """Time spent in ``stage`` itself, excluding the stages it pulls from."""
+        stats = self.stages[stage]
+        inner = sum(self.stages[name].inclusive_seconds for name in stats.exclusive_of)
+        return max(stats.inclusive_seconds - inner, 0.0)
+
+    def timed(self, iterable, stage: str, exclusive_of=()):
+        """Wrap ``iterable`` so the time spent producing each item is charged to ``stage``."""
+        stats = self.stages[stage]
+        stats.exclusive_of = tuple(exclusive_of)
+        iterator = iter(iterable)
+        clock = time.perf_counter
+        while True:
+            tracing = self._tracemalloc is not None
+            if tracing:
+                self._enter(stats)
+            started = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                stats.inclusive_seconds += clock() - started
+                if tracing:
+                    self._leave()
+            stats.items += 1
+            yield item
+
+    def _record_peak(self) -> None:
+        # The peak since the last stage switch belongs to every stage that was running meanwhile
+        peak = self._tracemalloc.get_traced_memory()[1]
+        self._tracemalloc.reset_peak()
+        self.peak_alloc_bytes = max(self.peak_alloc_bytes or 0, peak)
+        for stats in self._active:
+            stats.peak_alloc_bytes = max(stats.peak_alloc_bytes or 0, peak)
+
+    def _enter(self, stats: StageStats) -> None:
+        self._record_peak()
+        self._active.append(stats)
+
+    def _leave(self) -> None:
+        self._record_peak()
+        self._active.pop()
+
+    def track_output(self, chunks, exclusive_of=('scan', 'merge')):
+        """Wrap the final Markdown chunks: times the whole conversion and counts output."""
+        self._start()
+        clock = time.perf_counter
+        write = self.stages['write']
+        try:
+            for chunk in self.timed(chunks, 'render', exclusive_of):
+                self.output_bytes += len(chunk.encode('utf-8'))
+                tracing = self._tracemalloc is not None
+                if tracing:
+                    self._enter(write)
+                consumer_started = clock()
+                try:
+                    yield chunk
+                finally:
+                    write.inclusive_seconds += clock() - consumer_started
+                    if tracing:
+                        self._leave()
+                write.items += 1
+        finally:
+            self._finish()
+
+    def _start(self) -> None:
+        self._started = time.perf_counter()
+        if self.trace_memory:
+            import tracemalloc
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._tracemalloc = tracemalloc
+
+    def _finish(self) -> None:
+        self.total_seconds += time.perf_counter() - self._started
+        self.cue_count = self.stages['parse'].items or self.stages['scan'].items
+        self.turn_count = self.stages['merge'].items
+        if self._tracemalloc is not None:
+            self._record_peak()
+            if self._owns_tracemalloc:
+                self._tracemalloc.stop()
+            self._tracemalloc = None
+
+    def as_dict(self) -> dict:
+        return {
+            'stages': {name: {'seconds': self.seconds(name), 'items': self.stages[name].items,
+                              'peak_alloc_bytes': self.stages[name].peak_alloc_bytes}
+                       for name in STAGES},
+            'input_size': self.input_size,
+            'output_bytes': self.output_bytes,
+            'cue_count': self.cue_count,
+            'turn_count': self.turn_count,
+            'total_seconds': self.total_seconds,
+            'peak_alloc_bytes': self.peak_alloc_bytes,
+        }
+
+    def format(self) -> str:
+        return format_stats(self.as_dict())
+
+
+def sum_stats(stats_dicts) -> dict:
+    """Add up several :meth:`ConversionStats.as_dict` results (e.g. from worker processes)."""
+    total = {'stages': {name: {'seconds': 0.0, 'items': 0, 'peak_alloc_bytes': None} for name in STAGES},
+             'input_size': 0, 'output_bytes': 0, 'cue_count': 0, 'turn_count': 0,
+             'total_seconds': 0.0, 'peak_alloc_bytes': None}
+    for stats in stats_dicts:
+        # Peaks do not add up across files; the largest one is kept
+        for name in STAGES:
+            stage, total_stage = stats['stages'][name], total['stages'][name]
+            total_stage['seconds'] += stage['seconds']
+            total_stage['items'] += stage['items']
+            if stage['peak_alloc_bytes'] is not None:
+                total_stage['peak_alloc_bytes'] = max(total_stage['peak_alloc_bytes'] or 0, stage['peak_alloc_bytes'])
+        for key in ('input_size', 'output_bytes', 'cue_count', 'turn_count', 'total_seconds'):
+            total[key] += stats[key] or 0
+        if stats['peak_alloc_bytes'] is not None:
+            total['peak_alloc_bytes'] = max(total['peak_alloc_bytes'] or 0, stats['peak_alloc_bytes'])
+    return total
+
+
+def format_stats(stats: dict) -> str:
+    """Human-readable table for a :meth:`ConversionStats.as_dict` result."""
+    lines = []
+    for name, stage in stats['stages'].items():
+        line = f"{name:>7}: {stage['seconds'] * 1000:9.1f} ms  {stage['items']:>9} items"
+        if stage['peak_alloc_bytes'] is not None:
+            line += f"  {stage['peak_alloc_bytes'] / 1e6:7.1f} MB peak"
+        lines.append(line)
+    lines.append(f"  total: {stats['total_seconds'] * 1000:9.1f} ms  {stats['cue_count']} cues -> "
+                 f"{stats['turn_count']} turns, {stats['input_size'] or 0} in -> {stats['output_bytes']} bytes out")
+    if stats['peak_alloc_bytes'] is not None:
+        lines.append(f"   peak: {stats['peak_alloc_bytes'] / 1e6:.1f} MB allocated")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_to(path):
+    """Run the block under cProfile and dump pstats-compatible stats to ``path``."""
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(path))
@@ -0,0 +1,84 @@
+"""
+Structured renderers for merged speaker turns.
+
+Markdown is rendered by :class:`~vtt2md.converter.VttConverter` itself; the
+renderers here produce machine-readable output for indexing pipelines from
+the same streamed :class:`~vtt2md.converter.Turn` records:
+
+- ``jsonl``: one JSON object per turn
+  (``{"speaker": ..., "start_ms": ..., "end_ms": ..., "text": ...}``)
+- ``tsv``: a ``#speakers`` table (``id``, ``name``) followed by a ``#turns``
+  table (``speaker_id``, ``start_ms``, ``end_ms``, ``text``). Backslashes,
+  tabs and line breaks inside text are escaped as ``\\\\``, ``\\t``, ``\\n``
+  and ``\\r`` so every row stays on one line.
+
+A renderer gets the document summary once through :meth:`Renderer.header`
+and then every turn through :meth:`Renderer.turn`; each call returns the text
+to append. New formats are added by registering a subclass in
+:data:`RENDERERS`.
+"""
+import json
+from typing import NamedTuple
+
+
+class Document(NamedTuple):
+    """What the header pre-scan knows before the first turn is rendered."""
+    title: str
+    participants: list
+    first_start_ms: int
+    last_end_ms: int
+    cue_count: int
+
+
+class Renderer:
+    extension = ''
+
+    def header(self, document: Document) -> str:
+        return ''
+
+    def turn(self, turn) -> str:
+        raise NotImplementedError
+
+
+class JsonLinesRenderer(Renderer):
+    extension = '.jsonl'
+
+    def turn(self, turn) -> str:
+        return json.dumps({'speaker': turn.speaker, 'start_ms': turn.start_ms, 'end_ms': turn.end_ms,
+                           'text': turn.text}, ensure_ascii=False) + '\n'
+
+
+_TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class TsvRenderer(Renderer):
+    extension = '.tsv'
+
+    def __init__(self):
+        self._speaker_ids = {}
+
+    def header(self, document: Document) -> str:
+        # Participants come from the pre-scan, which sees exactly the speakers the merger emits
+        self._speaker_ids = {speaker: index for index, speaker in enumerate(document.participants)}
+        rows = ['#speakers', 'id\tname']
+        rows.extend(f"{index}\t{speaker.translate(_TSV_ESCAPES)}" for speaker, index in self._speaker_ids.items())
+        rows.extend(['#turns', 'speaker_id\tstart_ms\tend_ms\ttext'])
+        return '\n'.join(rows) + '\n'
+
+    def turn(self, turn) -> str:
+        return (f"{self._speaker_ids[turn.speaker]}\t{turn.start_ms}\t{turn.end_ms}\t"
+                f"{turn.text.translate(_TSV_ESCAPES)}\n")
+
+
+RENDERERS = {
+    'jsonl': JsonLinesRenderer,
+    'tsv': TsvRenderer,
+}
+OUTPUT_FORMATS = ('md', *RENDERERS)
+
+
+def get_renderer(name: str) -> Renderer:
+    try:
+        return RENDERERS[name]()
+    except KeyError:
+        raise ValueError(f"unknown output format {name!r} (choose from {', '.join(OUTPUT_FORMATS)})") from None
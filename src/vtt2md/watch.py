@@ -0,0 +1,309 @@
+"""
+Watch-folder mode: convert transcripts as they land in a directory.
+
+    python -m vtt2md watch //share/teams-exports -o out/ -j 4
+
+The directory is rescanned every ``--interval`` seconds; when the optional
+``watchdog`` package is installed, file system events wake the scan up
+immediately instead. A file is converted once its size and modification
+time have not changed for ``--settle`` seconds, so exports that are still
+being written are left alone. Conversions run on a bounded process pool
+through :func:`vtt2md.cli.convert_file`.
+
+The conversion cache next to the output doubles as the persistent index of
+processed files: after a restart, files whose input and output are
+unchanged are skipped without being converted again. Counters (pending and
+running files, results, latency from detection to output, throughput) are
+written as JSON to a status file that monitoring can scrape.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from vtt2md.cli import (
+    add_conversion_arguments, collision_error, conversion_defaults, convert_file, load_metadata, output_collisions,
+    output_path_for,
+)
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = Observer = None
+
+STATUS_FILENAME = '.vtt2md-watch.json'
+DEFAULT_INTERVAL_SECONDS = 2.0
+DEFAULT_SETTLE_SECONDS = 5.0
+# Recent latencies kept for the status file
+_LATENCY_WINDOW = 100
+
+
+def _wake_handler(wake: threading.Event):
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Only transcripts matter; the status file and cache also live here and change every cycle
+            paths = (event.src_path, getattr(event, 'dest_path', ''))
+            if any(str(path).lower().endswith('.vtt') for path in paths):
+                wake.set()
+    return WakeHandler()
+
+
+class FolderWatcher:
+    def __init__(self, directory, output_dir=None, defaults=None, workers: int = 1, recursive: bool = False,
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS, interval: float = DEFAULT_INTERVAL_SECONDS,
+                 status_path=None, cache_max_bytes: int | None = None, clock=time.monotonic):
+        self.directory = Path(directory)
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.defaults = defaults or {}
+        self.workers = max(workers, 1)
+        self.recursive = recursive
+        self.settle_seconds = settle_seconds
+        self.interval = interval
+        self.status_path = Path(status_path) if status_path else (self.output_dir or self.directory) / STATUS_FILENAME
+        self.cache_max_bytes = cache_max_bytes
+        self.clock = clock
+        self.wake = threading.Event()
+        # path -> (signature, first seen, signature unchanged since)
+        self._observed = {}
+        # .vtt files found by the last scan
+        self._present = set()
+        # path -> signature of the last conversion submitted this session
+        self._submitted = {}
+        self._ready = []
+        self._running = {}
+        self.started = time.time()
+        self.counters = {'converted': 0, 'skipped': 0, 'cached': 0, 'failed': 0, 'cues': 0, 'bytes': 0}
+        self.busy_seconds = 0.0
+        self.latencies = []
+        self.last_error = None
+
+    def _iter_vtt_files(self):
+        pattern = '**/*.vtt' if self.recursive else '*.vtt'
+        for path in self.directory.glob(pattern):
+            if path.is_file():
+                yield path
+
+    def scan(self) -> list[Path]:
+        """Rescan the directory and queue files whose size and mtime have settled; returns the newly ready ones."""
+        now = self.clock()
+        present = set()
+        ready = []
+        for path in self._iter_vtt_files():
+            present.add(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._submitted.get(path) == signature:
+                continue
+            observed = self._observed.get(path)
+            if observed is None or observed[0] != signature:
+                first_seen = observed[1] if observed else now
+                self._observed[path] = (signature, first_seen, now)
+                continue
+            if now - observed[2] >= self.settle_seconds and path not in self._running:
+                ready.append(path)
+        # Forget files that were removed before they settled
+        for path in self._observed.keys() - present:
+            del self._observed[path]
+        self._present = present
+        for path in ready:
+            signature, first_seen, _ = self._observed.pop(path)
+            self._submitted[path] = signature
+            self._ready.append((path, first_seen))
+        return ready
+
+    def _output_path(self, vtt_path: Path, metadata: dict) -> Path:
+        split = bool(metadata.get('split_max_chars')) and metadata.get('output_format', 'md') == 'md'
+        return output_path_for(vtt_path, self.output_dir, split=split,
+                               output_format=metadata.get('output_format', 'md'))
+
+    def _job(self, vtt_path: Path):
+        """The ``convert_file`` arguments for ``vtt_path``; ``ValueError`` holds the reason when it must not run."""
+        try:
+            metadata = load_metadata(vtt_path, self.defaults)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"invalid sidecar metadata: {e}") from e
+        md_path = self._output_path(vtt_path, metadata)
+        # Same-named files in different subfolders (-r) would overwrite one output and take turns
+        # owning its cache entry, so each restart would convert one of them again
+        pairs = [(vtt_path, md_path)]
+        for other in self._present:
+            if other != vtt_path and os.path.normcase(other.stem) == os.path.normcase(vtt_path.stem):
+                try:
+                    pairs.append((other, self._output_path(other, load_metadata(other, self.defaults))))
+                except (OSError, ValueError):
+                    continue
+        collisions = output_collisions(pairs)
+        if vtt_path in collisions:
+            raise ValueError(collision_error(md_path, collisions[vtt_path]))
+        return vtt_path, md_path, metadata
+
+    def _record(self, vtt_path: Path, first_seen: float, started: float, result: dict) -> None:
+        now = self.clock()
+        self.busy_seconds += now - started
+        if result['error']:
+            self.counters['failed'] += 1
+            self.last_error = f"{vtt_path}: {result['error']}"
+            print(f"FAILED {vtt_path}: {result['error']}", file=sys.stderr)
+        else:
+            self.counters[result['status']] += 1
+            if result['status'] == 'converted':
+                self.counters['cues'] += result['cues']
+                self.counters['bytes'] += result['bytes']
+                self.latencies = (self.latencies + [now - first_seen])[-_LATENCY_WINDOW:]
+                print(f"{result['input']} -> {result['output']}")
+
+    def _convert_inline(self) -> None:
+        while self._ready:
+            vtt_path, first_seen = self._ready.pop(0)
+            started = self.clock()
+            try:
+                result = convert_file(*self._job(vtt_path), self.cache_max_bytes)
+            except ValueError as e:
+                result = {'input': str(vtt_path), 'status': 'converted', 'error': str(e)}
+            self._record(vtt_path, first_seen, started, result)
+
+    def _submit_ready(self, executor) -> None:
+        # Keep at most one queued job per worker in flight so new files are not starved
+        while self._ready and len(self._running) < self.workers * 2:
+            vtt_path, first_seen = self._ready.pop(0)
+            try:
+                job = self._job(vtt_path)
+            except ValueError as e:
+                self._record(vtt_path, first_seen, self.clock(),
+                             {'input': str(vtt_path), 'status': 'converted', 'error': str(e)})
+                continue
+            try:
+                future = executor.submit(convert_file, *job, self.cache_max_bytes)
+            except BrokenProcessPool:
+                # Submitted again once run() has replaced the pool
+                self._ready.insert(0, (vtt_path, first_seen))
+                raise
+            self._running[vtt_path] = (future, first_seen, self.clock())
+            future.add_done_callback(lambda _: self.wake.set())
+
+    def _collect_done(self) -> None:
+        for vtt_path, (future, first_seen, started) in list(self._running.items()):
+            if future.done():
+                del self._running[vtt_path]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'input': str(vtt_path), 'status': 'converted', 'error': str(e)}
+                self._record(vtt_path, first_seen, started, result)
+
+    def status(self) -> dict:
+        uptime = max(time.time() - self.started, 1e-9)
+        latencies = sorted(self.latencies)
+        return {
+            'directory': str(self.directory),
+            'started': self.started,
+            'updated': time.time(),
+            'watching_with': 'watchdog' if Observer is not None else 'polling',
+            'observed': len(self._observed),
+            'pending': len(self._ready),
+            'running': len(self._running),
+            **self.counters,
+            'last_error': self.last_error,
+            'latency_seconds': {
+                'last': self.latencies[-1] if latencies else None,
+                'mean': sum(latencies) / len(latencies) if latencies else None,
+                'p95': latencies[int(len(latencies) * 0.95)] if latencies else None,
+            },
+            'throughput': {
+                'files_per_s': self.counters['converted'] / uptime,
+                'cues_per_s_busy': self.counters['cues'] / self.busy_seconds if self.busy_seconds else None,
+                'mb_per_s_busy': self.counters['bytes'] / 1e6 / self.busy_seconds if self.busy_seconds else None,
+            },
+        }
+
+    def write_status(self) -> None:
+        # Write-then-rename so a scraper never reads a half-written file
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.status_path.with_name(self.status_path.name + '.tmp')
+        tmp.write_text(json.dumps(self.status(), indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.status_path)
+
+    def run_once(self, executor=None) -> None:
+        """One scan / submit / collect cycle, then a status update."""
+        self.scan()
+        if executor is None:
+            self._convert_inline()
+        else:
+            self._collect_done()
+            self._submit_ready(executor)
+        self.write_status()
+
+    def run(self, stop_event: threading.Event | None = None) -> None:
+        """Watch until ``stop_event`` is set or the process is interrupted."""
+        stop_event = stop_event or threading.Event()
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_wake_handler(self.wake), str(self.directory), recursive=self.recursive)
+            observer.start()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            while not stop_event.is_set():
+                try:
+                    self.run_once(executor)
+                except BrokenProcessPool:
+                    # A worker died (killed, out of memory); its files are failed and the pool replaced
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._collect_done()
+                    executor = ProcessPoolExecutor(max_workers=self.workers)
+                    continue
+                # Pending files need a recheck once they may have settled, even without new events
+                timeout = self.interval
+                if self._observed:
+                    timeout = min(timeout, self.settle_seconds)
+                self.wake.wait(timeout)
+                self.wake.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+                self._collect_done()
+            self.write_status()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='vtt2md watch',
+                                     description="Convert Teams VTT transcripts as they appear in a directory.")
+    parser.add_argument('directory', type=Path, help="directory to watch for .vtt files")
+    add_conversion_arguments(parser)
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL_SECONDS,
+                        help="seconds between directory scans (default: %(default)s)")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is converted (default: %(default)s)")
+    parser.add_argument('--status-file', type=Path,
+                        help=f"JSON status file with counters (default: {STATUS_FILENAME} in the output directory)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.directory.is_dir():
+        parser.error(f"not a directory: {args.directory}")
+    defaults = conversion_defaults(args, parser)
+
+    watcher = FolderWatcher(args.directory, args.output_dir, defaults, workers=args.workers,
+                            recursive=args.recursive, settle_seconds=args.settle, interval=args.interval,
+                            status_path=args.status_file, cache_max_bytes=args.cache_size * 1024 * 1024)
+    print(f"Watching {args.directory} ({watcher.status()['watching_with']}); status in {watcher.status_path}. "
+          "Press Ctrl+C to stop.")
+    watcher.run()
+    return 0
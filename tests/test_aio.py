@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import vtt2md.converter
+from vtt2md.aio import aconvert
+from vtt2md.converter import VttConverter
+
+VTT = "WEBVTT\n" + "".join(
+    f"\n00:{i // 60:02d}:{i % 60:02d}.000 --> 00:{i // 60:02d}:{i % 60:02d}.900\n<v 話者 {i % 3}>発言その{i}です。\n"
+    for i in range(600))
+DATETIME = "2025-01-31 14:30"
+
+
+async def byte_chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        # Give other tasks a chance to run between network reads
+        await asyncio.sleep(0)
+        yield data[start:start + size]
+
+
+class Reader:
+    """Minimal stand-in for aiohttp's StreamReader."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def read(self, n: int) -> bytes:
+        chunk, self.data = self.data[:n], self.data[n:]
+        return chunk
+
+
+async def collect(stream, **kwargs):
+    return [chunk async for chunk in aconvert(stream, "meeting.vtt", meeting_datetime=DATETIME, **kwargs)]
+
+
+def test_aconvert_matches_sync_output():
+    """Tests that the async API yields the same Markdown for chunked byte streams and read() streams."""
+    expected = VttConverter(VTT, "meeting.vtt", meeting_datetime=DATETIME).to_markdown()
+
+    # 7-byte pieces split UTF-8 characters across reads
+    chunks = asyncio.run(collect(byte_chunks(VTT.encode("utf-8"), 7), batch_chars=1000))
+    assert "".join(chunks) == expected
+    assert len(chunks) > 2
+    assert "".join(asyncio.run(collect(Reader(VTT.encode("utf-8-sig"))))) == expected
+
+
+def test_aconvert_raises_for_invalid_input():
+    """Tests that conversion errors surface to the async consumer."""
+    with pytest.raises(ValueError):
+        asyncio.run(collect(Reader(b"not a transcript")))
+
+
+def test_aconvert_scans_while_uploading(monkeypatch):
+    """Tests that the header pre-scan runs on the arriving bytes, leaving one pass over the spooled upload."""
+    expected = VttConverter(VTT, "meeting.vtt", meeting_datetime=DATETIME).to_markdown()
+    passes = []
+    iter_cues = vtt2md.converter.iter_cues
+    monkeypatch.setattr(vtt2md.converter, "iter_cues", lambda source: passes.append(source) or iter_cues(source))
+
+    chunks = asyncio.run(collect(byte_chunks(VTT.encode("utf-8"), 512)))
+
+    assert "".join(chunks) == expected
+    assert len(passes) == 1
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from vtt2md.cache import ConversionCache
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Tests that the cache stays under its size limit by evicting the oldest entries."""
+    md_path = tmp_path / "a.md"
+    md_path.write_bytes(os.urandom(4000).replace(b"\0", b"\1"))  # incompressible, NUL-free like Markdown
+
+    restored = lambda index: tmp_path / "restored.md"
+
+    with ConversionCache(tmp_path / "cache.sqlite", max_bytes=10000) as cache:
+        cache.store("first", [md_path])
+        cache.store("second", [md_path])
+        assert cache.restore("first", restored)  # refresh "first"
+        cache.store("third", [md_path])
+
+        assert cache.restore("first", restored)
+        assert not cache.restore("second", restored)
+        assert cache.restore("third", restored)
+    assert (tmp_path / "restored.md").read_bytes() == md_path.read_bytes()
+
+
+def test_cache_restores_split_parts(tmp_path):
+    """Tests that several output files are stored under one key and restored part by part."""
+    parts = []
+    for index, text in enumerate(["# part 1\n", "# part 2\n", ""]):
+        parts.append(tmp_path / f"part{index}.md")
+        parts[-1].write_text(text, encoding="utf-8")
+
+    with ConversionCache(tmp_path / "cache.sqlite") as cache:
+        cache.store("key", parts)
+        assert cache.restore("key", lambda index: tmp_path / "out" / f"{index}.md")
+
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["0.md", "1.md", "2.md"]
+    assert (tmp_path / "out" / "1.md").read_text(encoding="utf-8") == "# part 2\n"
@@ -0,0 +1,207 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import pytest
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from vtt2md.cli import collect_inputs, main, output_collisions, output_path_for
+
+VTT = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+<v Speaker 1>Hello from the batch converter.
+"""
+
+
+def test_collect_inputs(tmp_path):
+    """Tests expansion of directories, globs and plain files into unique .vtt paths."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "b.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+
+    paths = collect_inputs([str(tmp_path), str(tmp_path / "*.vtt"), str(tmp_path / "a.vtt")])
+
+    assert [p.name for p in paths] == ["a.vtt", "b.vtt"]
+
+
+def test_main_converts_directory_with_sidecar(tmp_path, capsys):
+    """Tests a batch run using command-line and sidecar metadata."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "b.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "b.meta.json").write_text(json.dumps({"meeting_datetime": "2024-12-24 09:15"}), encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    exit_code = main([str(tmp_path), "-o", str(out_dir), "-j", "2", "--datetime", "2025-01-31 14:30"])
+
+    assert exit_code == 0
+    assert "**日時:** 2025年01月31日 14:30" in (out_dir / "a.md").read_text(encoding="utf-8")
+    assert "**日時:** 2024年12月24日 09:15" in (out_dir / "b.md").read_text(encoding="utf-8")
+    assert "2 files, 2 cues" in capsys.readouterr().out
+
+
+def test_main_reports_failures(tmp_path):
+    """Tests that an invalid file fails without aborting the batch."""
+    (tmp_path / "good.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "bad.vtt").write_text("not a vtt", encoding="utf-8")
+
+    exit_code = main([str(tmp_path), "-j", "1"])
+
+    assert exit_code == 1
+    assert (tmp_path / "good.md").exists()
+
+
+def test_main_reports_unknown_sidecar_format(tmp_path, capsys):
+    """Tests that a sidecar with an unknown output format fails that file only."""
+    (tmp_path / "good.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "bad.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "bad.meta.json").write_text(json.dumps({"output_format": "xml"}), encoding="utf-8")
+
+    exit_code = main([str(tmp_path), "-j", "1"])
+
+    assert exit_code == 1
+    assert (tmp_path / "good.md").exists()
+    assert f"FAILED {tmp_path / 'bad.vtt'}: invalid sidecar metadata: unknown output_format 'xml'" in capsys.readouterr().err
+
+
+def test_failure_before_writing_keeps_previous_output(tmp_path):
+    """Tests that invalid metadata fails the file without deleting its output from an earlier run."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    expected = (tmp_path / "a.md").read_text(encoding="utf-8")
+
+    (tmp_path / "a.meta.json").write_text(json.dumps({"meeting_datetime": "yesterday"}), encoding="utf-8")
+
+    assert main([str(tmp_path), "-j", "1"]) == 1
+    assert (tmp_path / "a.md").read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("extra_args", [[], ["--split", "400"], ["--format", "jsonl"]])
+def test_main_fails_transcript_without_captions(tmp_path, capsys, extra_args):
+    """Tests that a header-only file fails in every format and writes or caches nothing."""
+    (tmp_path / "empty.vtt").write_text("WEBVTT\n\nNOTE no captions\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    args = [str(tmp_path), "-o", str(out_dir), "-j", "1", *extra_args]
+
+    for _ in range(2):
+        assert main(args) == 1
+        assert "Could not find any captions" in capsys.readouterr().err
+    assert [p.name for p in out_dir.rglob("*") if not p.name.startswith(".")] == []
+
+
+def test_main_reuses_conversion_cache(tmp_path, capsys):
+    """Tests that re-runs skip unchanged inputs, restore deleted outputs and honour option changes."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+    out_dir = tmp_path / "out"
+    args = [str(tmp_path), "-o", str(out_dir), "-j", "1", "--datetime", "2025-01-31 14:30"]
+    assert main(args) == 0
+    expected = (out_dir / "a.md").read_text(encoding="utf-8")
+    capsys.readouterr()
+
+    assert main(args) == 0
+    assert "1 unchanged file(s) skipped, 0 restored" in capsys.readouterr().out
+
+    (out_dir / "a.md").unlink()
+    assert main(args) == 0
+    assert "0 unchanged file(s) skipped, 1 restored" in capsys.readouterr().out
+    assert (out_dir / "a.md").read_text(encoding="utf-8") == expected
+
+    assert main(args[:-1] + ["2025-02-01 10:00"]) == 0
+    assert "1 files, 1 cues" in capsys.readouterr().out
+    assert "2025年02月01日 10:00" in (out_dir / "a.md").read_text(encoding="utf-8")
+
+
+def test_main_split_output(tmp_path):
+    """Tests split mode writing parts into a folder and restoring them from the cache."""
+    vtt = "WEBVTT\n" + "".join(
+        f"\n00:{i:02d}:00.000 --> 00:{i:02d}:01.000\n<v Speaker {i % 2}>Sentence number {i}.\n" for i in range(40))
+    (tmp_path / "long.vtt").write_text(vtt, encoding="utf-8")
+    out_dir = tmp_path / "out"
+    args = [str(tmp_path), "-o", str(out_dir), "-j", "1", "--split", "400"]
+
+    assert main(args) == 0
+    parts = sorted((out_dir / "long").glob("long_part*.md"))
+    contents = [p.read_text(encoding="utf-8") for p in parts]
+    assert len(parts) > 1
+    assert all(len(c) <= 400 for c in contents)
+    assert contents[1].startswith("# long (2)")
+
+    for part in parts:
+        part.unlink()
+    assert main(args) == 0
+    assert [p.read_text(encoding="utf-8") for p in sorted((out_dir / "long").glob("long_part*.md"))] == contents
+
+
+def test_main_profile(tmp_path, capsys):
+    """Tests that --profile prints stage timings and --profile-dump writes pstats data."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+    dump = tmp_path / "convert.prof"
+
+    assert main([str(tmp_path), "--no-cache", "--profile", "--profile-dump", str(dump)]) == 0
+
+    out = capsys.readouterr().out
+    assert "  merge:" in out and "render:" in out
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+    assert main([str(tmp_path), "--no-cache", "--profile-memory"]) == 0
+    out = capsys.readouterr().out
+    assert "  parse:" in out and "MB peak" in out and "bytes out" in out
+
+
+def test_main_structured_formats(tmp_path):
+    """Tests that --format writes .jsonl / .tsv files next to the input and rejects --split."""
+    (tmp_path / "a.vtt").write_text(VTT, encoding="utf-8")
+
+    assert main([str(tmp_path), "--format", "jsonl"]) == 0
+    record = json.loads((tmp_path / "a.jsonl").read_text(encoding="utf-8"))
+    assert record == {"speaker": "Speaker 1", "start_ms": 1000, "end_ms": 3000,
+                      "text": "Hello from the batch converter."}
+
+    assert main([str(tmp_path), "--format", "tsv", "--no-cache"]) == 0
+    assert (tmp_path / "a.tsv").read_text(encoding="utf-8").endswith("0\t1000\t3000\tHello from the batch converter.\n")
+    assert not (tmp_path / "a.md").exists()
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "--format", "tsv", "--split"])
+
+
+def test_headless_entry_point_does_not_import_tk():
+    """Tests that the command line entry point starts without Tk or the process pool machinery."""
+    code = ("import sys; import vtt2md.__main__; "
+            "print(sorted(m for m in ('tkinter', 'customtkinter', 'tkcalendar', 'concurrent.futures.process') "
+            "if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                          env=dict(os.environ, PYTHONPATH=src_path))
+    assert proc.stdout.strip() == "[]"
+
+
+def test_main_rejects_colliding_outputs(tmp_path, capsys):
+    """Tests that inputs sharing a name in different folders fail instead of overwriting one output."""
+    for folder in ("a", "b"):
+        (tmp_path / "in" / folder).mkdir(parents=True)
+        (tmp_path / "in" / folder / "standup.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "in" / "a" / "other.vtt").write_text(VTT, encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    assert main([str(tmp_path / "in"), "-r", "-o", str(out_dir), "-j", "2"]) == 1
+
+    err = capsys.readouterr().err
+    assert err.count("FAILED") == 2 and "would also be written by" in err
+    assert not (out_dir / "standup.md").exists()
+    assert (out_dir / "other.md").exists()
+
+
+def test_output_collisions(tmp_path):
+    """Tests that only inputs sharing an output path are reported, each with the other inputs."""
+    inputs = [tmp_path / "a" / "x.vtt", tmp_path / "b" / "x.vtt", tmp_path / "a" / "y.vtt"]
+    out_dir = tmp_path / "out"
+
+    collisions = output_collisions((p, output_path_for(p, out_dir)) for p in inputs)
+
+    assert collisions == {inputs[0]: [inputs[1]], inputs[1]: [inputs[0]]}
+    assert output_collisions((p, output_path_for(p, None)) for p in inputs) == {}
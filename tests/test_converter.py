@@ -9,7 +9,15 @@ src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from vtt2md.converter import VttConverter
+import io
+import threading
+from datetime import datetime
+
+from vtt2md.converter import (
+    VttConverter, convert_vtt_to_md, iter_cues, stream_vtt_to_md, _parse_timestamp_ms,
+    _extract_speaker_fragments, merge_turns, Cue, Turn, SpeakerTable, ConversionCancelled, guess_meeting_datetime,
+)
+from vtt2md.profiling import ConversionStats
 
 # --- Fixtures for test data ---
 
@@ -156,3 +164,327 @@ def test_metadata_generation(simple_vtt, tmp_path):
     assert "- Speaker 2" in md
     assert "所要時間:" in md
     assert "日時:" in md # Check for date
+
+def test_iter_cues_streams_from_file_object(teams_uuid_vtt):
+    """Tests that cues are parsed incrementally from a file object in small chunks."""
+    cues = list(iter_cues(io.StringIO(teams_uuid_vtt), chunk_size=8))
+
+    assert len(cues) == 1
+    assert cues[0].start_ms == 5000
+    assert cues[0].end_ms == 7000
+    assert cues[0].start == "00:00:05.000"
+    assert cues[0].raw_text == "<v User 1>Hello from Teams."
+
+def test_iter_cues_from_path(tmp_path):
+    """Tests parsing from a path, including multi-line cues, NOTE blocks and MM:SS timestamps."""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(
+        "\ufeffWEBVTT\r\n\r\nNOTE exported by Teams\r\n\r\n"
+        "e4b71968-46d8-4199-a56a-f5d6f4584268/2-0\r\n"
+        "01:05.000 --> 01:07.500 align:start\r\n<v Speaker 1>First line\r\nsecond line</v>\r\n",
+        encoding="utf-8",
+    )
+
+    cues = list(iter_cues(file_path))
+
+    assert len(cues) == 1
+    assert cues[0].start == "00:01:05.000"
+    assert cues[0].end == "00:01:07.500"
+    assert cues[0].raw_text == "<v Speaker 1>First line\nsecond line</v>"
+
+def test_iter_cues_rejects_missing_header():
+    """Tests that content without a WEBVTT header is rejected."""
+    with pytest.raises(ValueError):
+        list(iter_cues("00:00:01.000 --> 00:00:02.000\n<v A>Hi\n"))
+
+def test_stream_vtt_to_md_matches_to_markdown(simple_vtt, tmp_path):
+    """Tests that streaming output from a path is identical to the in-memory Markdown."""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(simple_vtt, encoding="utf-8")
+    expected = VttConverter(simple_vtt, str(file_path)).to_markdown()
+
+    out = io.StringIO()
+    stream_vtt_to_md(file_path, str(file_path), out=out)
+    chunks = list(stream_vtt_to_md(io.StringIO(simple_vtt), str(file_path)))
+
+    assert out.getvalue() == expected
+    assert "".join(chunks) == expected
+    # Header first, then one chunk per merged turn
+    assert len(chunks) == 3
+
+def test_file_object_without_seekable(simple_vtt):
+    """Tests that file objects lacking seekable() (SpooledTemporaryFile before 3.11) are accepted."""
+    class Spooled:
+        def __init__(self, data):
+            self._file = io.BytesIO(data)
+            self.read, self.seek, self.tell = self._file.read, self._file.seek, self._file.tell
+
+    expected = VttConverter(simple_vtt, "test.vtt", meeting_datetime="2025-01-31 14:30").to_markdown()
+    converter = VttConverter(Spooled(simple_vtt.encode("utf-8")), "test.vtt", meeting_datetime="2025-01-31 14:30")
+
+    assert converter.to_markdown() == expected
+
+def test_parse_timestamp_ms():
+    """Tests the integer-millisecond timestamp parser, including short and >24h forms."""
+    assert _parse_timestamp_ms("00:00:01.500") == 1500
+    assert _parse_timestamp_ms("01:05.25") == 65250
+    assert _parse_timestamp_ms("25:00:00.001") == 90000001
+    with pytest.raises(ValueError):
+        _parse_timestamp_ms("1:2:3:4")
+
+def test_timestamps_past_24_hours(tmp_path):
+    """Tests that long recordings render [HH:MM:SS] past 23:59:59 and keep the duration."""
+    vtt = """WEBVTT
+
+00:00:00.000 --> 00:00:02.000
+<v Speaker 1>Start.
+
+24:00:05.000 --> 24:00:07.000
+<v Speaker 1>Next day.
+"""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(vtt, encoding="utf-8")
+
+    md = VttConverter(vtt, str(file_path)).to_markdown()
+
+    assert "**Speaker 1** [24:00:05]" in md
+    assert "**所要時間:** 1440分" in md
+
+def test_extract_speaker_fragments():
+    """Tests single-pass speaker/text extraction with inline tags and one fragment per voice span."""
+    assert _extract_speaker_fragments("<v Speaker 1>Hello</v>") == [("Speaker 1", "Hello")]
+    assert _extract_speaker_fragments(
+        "<v.loud Speaker 1><i>Hi</i> <c.yellow>there</c>\n<lang en>again</lang></v>") == [
+        ("Speaker 1", "Hi there\nagain")]
+    assert _extract_speaker_fragments("<v A>one</v> <v B>two</v>") == [("A", "one"), ("B", "two")]
+    assert _extract_speaker_fragments("<v A>one</v> <v A>two</v>") == [("A", "one two")]
+    assert _extract_speaker_fragments("<00:00:01.000>No voice") == [(None, "No voice")]
+    assert _extract_speaker_fragments("plain text") == [(None, "plain text")]
+
+def test_multiple_voices_in_one_cue(tmp_path):
+    """Tests that each voice span of a cue is attributed to its own speaker, in turns, header and stats."""
+    vtt = """WEBVTT
+
+00:00:01.000 --> 00:00:05.000
+<v Alice>Shall we start?</v>
+<v Bob>Yes, go ahead.</v>
+
+00:00:06.000 --> 00:00:08.000
+<v Bob>First item.</v>
+"""
+    vtt_file = tmp_path / "test.vtt"
+    vtt_file.touch()
+    cues = list(iter_cues(vtt))
+    speakers = SpeakerTable()
+
+    turns = list(merge_turns(cues, speakers=speakers))
+
+    assert turns == [Turn("Alice", 1000, 5000, "Shall we start?"),
+                     Turn("Bob", 1000, 8000, "Yes, go ahead. First item.")]
+    assert speakers.talk_ms == [2068, 1932 + 2000]  # the shared cue is split by text length
+    md = VttConverter(vtt, str(vtt_file), speaker_stats=True).to_markdown()
+    assert "- Alice\n- Bob" in md
+    assert "**Bob** [00:00:01]  \nYes, go ahead. First item." in md
+
+def test_merge_turns_long_monologue():
+    """Tests that a long run of cues from one speaker merges into a single turn."""
+    cues = [Cue(i * 1000, i * 1000 + 900, f"<v A>w{i}") for i in range(5000)]
+    cues.append(Cue(5_000_000, 5_001_000, "<v B>reply"))
+
+    turns = list(merge_turns(cues))
+
+    assert len(turns) == 2
+    assert turns[0] == Turn("A", 0, 4999900, " ".join(f"w{i}" for i in range(5000)))
+    assert turns[1].speaker == "B"
+
+def test_speaker_table_aggregates():
+    """Tests that merge_turns interns speakers and accumulates turns, talk time and characters."""
+    cues = [Cue(0, 1000, "<v A>abc"), Cue(1500, 2000, "<v A>de"), Cue(3000, 6000, "<v B>fghi"),
+            Cue(100_000, 101_000, "<v A>j")]
+    speakers = SpeakerTable()
+
+    turns = list(merge_turns(cues, speakers=speakers))
+
+    assert speakers.names == ["A", "B"]
+    assert speakers.turn_counts == [2, 1]
+    assert speakers.talk_ms == [2500, 3000]
+    assert speakers.char_counts == [6, 4]
+    assert turns[0].speaker is turns[2].speaker
+
+def test_speaker_stats_section(simple_vtt, tmp_path):
+    """Tests the optional 発言統計 section, sorted by talk time, in full and split output."""
+    vtt_file = tmp_path / "test.vtt"
+    vtt_file.touch()
+
+    md = VttConverter(simple_vtt, str(vtt_file), speaker_stats=True).to_markdown()
+    section = md.split("## 発言統計\n")[1]
+    rows = [line for line in section.splitlines() if line.startswith("| Speaker")]
+    assert rows == ["| Speaker 2 | 1 | 00:00:03 | 63.6% | 52 |", "| Speaker 1 | 1 | 00:00:02 | 36.4% | 22 |"]
+    assert "発言統計" not in VttConverter(simple_vtt, str(vtt_file)).to_markdown()
+
+    parts = list(VttConverter(simple_vtt, str(vtt_file), speaker_stats=True).iter_markdown_parts(300))
+    assert all(len(part) <= 300 for part in parts)
+    assert "## 発言統計" in parts[-1]
+
+def test_remove_fillers(tmp_path):
+    """Tests that filler removal cleans turns, drops backchannel cues and lets turns merge across them."""
+    vtt = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+<v Speaker 1>えー、資料を確認しました。
+
+00:00:03.000 --> 00:00:04.000
+<v Speaker 2>うん。
+
+00:00:04.000 --> 00:00:06.000
+<v Speaker 1>あのー、次に進みます。
+"""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(vtt, encoding="utf-8")
+
+    md = VttConverter(vtt, str(file_path), remove_fillers=True).to_markdown()
+
+    assert "資料を確認しました。 次に進みます。" in md
+    assert "Speaker 2" not in md
+    assert "えー" not in md
+
+def test_split_output_respects_budget(merged_vtt, tmp_path):
+    """Tests that split parts stay within the budget, cut between turns and keep all text."""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(merged_vtt, encoding="utf-8")
+    converter = VttConverter(merged_vtt, str(file_path))
+    full = converter.to_markdown()
+
+    assert list(converter.iter_markdown_parts(len(full))) == [full]
+
+    parts = list(converter.iter_markdown_parts(len(full) - 1))
+    assert len(parts) == 2
+    assert all(len(part) <= len(full) - 1 for part in parts)
+    assert parts[1].startswith("# test (2)")
+    assert "This is a third part, but too far away to merge." in parts[1]
+
+def test_split_output_breaks_oversized_turn(tmp_path):
+    """Tests that a single turn longer than the budget continues across parts at sentence ends."""
+    sentences = " ".join(f"Sentence {i} is here." for i in range(60))
+    vtt = f"WEBVTT\n\n00:00:01.000 --> 00:00:03.000\n<v Speaker 1>{sentences}\n"
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(vtt, encoding="utf-8")
+
+    parts = convert_vtt_to_md(vtt, str(file_path), split_output=True, max_chars=400)
+
+    assert len(parts) > 3
+    assert all(len(part) <= 400 for part in parts)
+    assert all("**Speaker 1** [00:00:01]" in part for part in parts)
+    assert all(part.rstrip().endswith(".") for part in parts)
+
+def test_conversion_stats(merged_vtt, tmp_path):
+    """Tests that per-stage statistics are recorded without changing the output."""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(merged_vtt, encoding="utf-8")
+    stats = ConversionStats(trace_memory=True)
+
+    md = VttConverter(file_path, str(file_path), stats=stats).to_markdown()
+
+    assert md == VttConverter(merged_vtt, str(file_path)).to_markdown()
+    assert stats.cue_count == 3
+    assert stats.turn_count == 2
+    assert stats.stages["scan"].items == 3
+    assert stats.stages["render"].items == 3  # header + two turns
+    assert stats.input_size == file_path.stat().st_size
+    assert stats.output_bytes == len(md.encode("utf-8"))
+    assert stats.peak_alloc_bytes > 0
+    assert 0 < stats.stages["parse"].peak_alloc_bytes <= stats.stages["render"].peak_alloc_bytes
+    assert stats.stages["render"].peak_alloc_bytes <= stats.peak_alloc_bytes
+    assert all(stats.seconds(stage) >= 0 for stage in stats.stages)
+
+def _many_cues_vtt(count):
+    return "WEBVTT\n" + "".join(
+        f"\n00:00:{i % 60:02d}.000 --> 00:00:{i % 60:02d}.500\n<v Speaker {i % 3}>Line {i}\n" for i in range(count))
+
+def test_progress_reporting(tmp_path):
+    """Tests that progress is reported for the scan and the conversion pass."""
+    vtt = _many_cues_vtt(2500)
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(vtt, encoding="utf-8")
+    events = []
+
+    VttConverter(vtt, str(file_path), progress_callback=lambda *args: events.append(args)).to_markdown()
+
+    assert ("scan", 1000, None) in events
+    assert ("scan", 2500, 2500) in events
+    assert ("parse", 2000, 2500) in events
+    assert events[-1] == ("parse", 2500, 2500)
+
+def test_cancellation(tmp_path):
+    """Tests that setting the cancel event stops the conversion between cue batches."""
+    vtt = _many_cues_vtt(2500)
+    file_path = tmp_path / "test.vtt"
+    file_path.write_text(vtt, encoding="utf-8")
+    cancel_event = threading.Event()
+
+    def cancel_after_scan(stage, done, total):
+        if stage == "parse":
+            cancel_event.set()
+
+    converter = VttConverter(vtt, str(file_path), progress_callback=cancel_after_scan, cancel_event=cancel_event)
+    with pytest.raises(ConversionCancelled):
+        converter.to_markdown()
+
+def test_guess_meeting_datetime(simple_vtt, tmp_path):
+    """Tests meeting datetime defaults from VTT header notes, the file name and the modification time."""
+    noted = tmp_path / "notes.vtt"
+    noted.write_text("WEBVTT\n\nNOTE recorded 2025/1/31 14:30\n\n" + simple_vtt[len("WEBVTT\n"):], encoding="utf-8")
+    named = tmp_path / "20240605_0915 定例.vtt"
+    named.write_text(simple_vtt, encoding="utf-8")
+    plain = tmp_path / "test.vtt"
+    plain.write_text(simple_vtt, encoding="utf-8")
+    os.utime(plain, (1700000000, 1700000000))
+
+    assert guess_meeting_datetime(noted) == "2025-01-31 14:30"
+    assert guess_meeting_datetime(named) == "2024-06-05 09:15"
+    assert guess_meeting_datetime(plain) == datetime.fromtimestamp(1700000000).strftime("%Y-%m-%d %H:%M")
+
+    # Teams cue identifiers are hex and may contain date-like digit runs
+    teams = tmp_path / "teams.vtt"
+    teams.write_text("WEBVTT\n\n3a202503-12ab-4c9d-8e7f-0123456789ab/1-0\n00:00:01.000 --> 00:00:02.000\n"
+                     "<v A>Hello</v>\n", encoding="utf-8")
+    os.utime(teams, (1700000000, 1700000000))
+    assert guess_meeting_datetime(teams) == datetime.fromtimestamp(1700000000).strftime("%Y-%m-%d %H:%M")
+    (tmp_path / "build120250131.vtt").write_text(simple_vtt, encoding="utf-8")
+    os.utime(tmp_path / "build120250131.vtt", (1700000000, 1700000000))
+    assert guess_meeting_datetime(tmp_path / "build120250131.vtt") == datetime.fromtimestamp(
+        1700000000).strftime("%Y-%m-%d %H:%M")
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "shift_jis"])
+def test_encoding_detection(encoding, tmp_path):
+    """Tests that BOM, UTF-16 and Shift_JIS exports are decoded from paths and binary file objects."""
+    vtt = "WEBVTT\r\n\r\n00:00:01.000 --> 00:00:03.000\r\n<v 遠藤 真輝>資料を確認しました。\r\n"
+    file_path = tmp_path / "test.vtt"
+    file_path.write_bytes(vtt.encode(encoding))
+
+    from_path = list(iter_cues(file_path, chunk_size=7))
+    with open(file_path, "rb") as f:
+        from_binary = list(iter_cues(f, chunk_size=5))
+
+    assert from_path == from_binary == [Cue(1000, 3000, "<v 遠藤 真輝>資料を確認しました。")]
+
+def test_shift_jis_after_long_ascii_prefix(tmp_path):
+    """Tests that a Shift_JIS file whose first 64KB are ASCII is not mistaken for UTF-8."""
+    cue = "00:00:01.000 --> 00:00:02.000\n<v Speaker>Hello</v>\n\n"
+    vtt = "WEBVTT\n\n" + cue * 2000 + "00:00:03.000 --> 00:00:04.000\n<v 遠藤 真輝>資料を確認しました。</v>\n"
+    file_path = tmp_path / "test.vtt"
+    file_path.write_bytes(vtt.encode("shift_jis"))
+    assert len(vtt.split("遠藤")[0]) > 64 * 1024
+
+    for chunk_size in (4096, 1 << 20):
+        cues = list(iter_cues(file_path, chunk_size=chunk_size))
+        assert len(cues) == 2001
+        assert cues[-1] == Cue(3000, 4000, "<v 遠藤 真輝>資料を確認しました。</v>")
+
+def test_empty_file_is_rejected(tmp_path):
+    """Tests that an empty file fails with a missing header error instead of an mmap error."""
+    file_path = tmp_path / "test.vtt"
+    file_path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="WEBVTT"):
+        list(iter_cues(file_path))
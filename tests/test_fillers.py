@@ -0,0 +1,39 @@
+import os
+import sys
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from vtt2md.fillers import FillerFilter, load_word_list
+
+
+def test_fillers_removed_only_between_delimiters():
+    """Tests that standalone fillers are removed while words that merely start with one are kept."""
+    fillers = FillerFilter()
+
+    assert fillers.clean("えー、それで、あのー、これは") == "それで、これは"
+    assert fillers.clean("あの人は来ますか") == "あの人は来ますか"
+    assert fillers.clean("Um, so we, uh, decided") == "so we, decided"
+    assert fillers.clean("The umbrella") == "The umbrella"
+
+
+def test_pure_backchannel_cues_are_dropped():
+    """Tests that cues consisting only of backchannels or fillers become empty."""
+    fillers = FillerFilter()
+
+    for text in ("うん。", "はい、はい。", "えー。", "Yeah.", "Mm-hmm, okay"):
+        assert fillers.clean(text) == ""
+    assert fillers.clean("はい、お願いします") == "はい、お願いします"
+
+
+def test_custom_word_list(tmp_path):
+    """Tests loading a Markdown word list and using it instead of the defaults."""
+    word_list = tmp_path / "fillers.md"
+    word_list.write_text("# フィラー\n\n- なんか\n- えー\n", encoding="utf-8")
+
+    fillers = FillerFilter(fillers=load_word_list(word_list), backchannels=())
+
+    assert fillers.clean("なんか、いい感じ") == "いい感じ"
+    assert fillers.clean("うん") == "うん"
@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import vtt2md.parallel
+from vtt2md.converter import Turn, SpeakerTable, VttConverter
+from vtt2md.parallel import MergedSegments, plan_segments, stitch_segments
+
+LINES = ("資料の構成について確認させてください。", "えー、納期は来月末で問題ないと思います。", "うん。", "Yeah.",
+         "Let's go through the open items.\nSecond line of the cue.")
+
+
+def write_transcript(path, cue_count: int, encoding: str = "utf-8", newline: str = "\n"):
+    """Teams-style transcript with long monologues, gaps beyond the merge threshold and backchannels."""
+    rng = random.Random(cue_count)
+    blocks = ["WEBVTT\n", "NOTE exported by Teams\nsecond note line\n"]
+    position_ms = 0
+    speaker = 0
+    for index in range(cue_count):
+        if rng.random() < 0.3:
+            speaker = rng.randrange(4)
+        position_ms += rng.choice((200, 1500, 61_000))
+        end_ms = position_ms + rng.randrange(500, 4000)
+        start, end = (f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+                      for ms in (position_ms, end_ms))
+        position_ms = end_ms
+        blocks.append(f"6f1c7d2e-0b9a-4c55-9f3e-2d8b1a7c4e10/{index}-0\n{start} --> {end}\n"
+                      f"<v 話者 {speaker}>{rng.choice(LINES)}</v>\n")
+    path.write_bytes("\n".join(blocks).replace("\n", newline).encode(encoding))
+
+
+@pytest.mark.parametrize("encoding, newline", [("utf-8", "\n"), ("utf-8-sig", "\r\n"), ("cp932", "\n")])
+@pytest.mark.parametrize("remove_fillers", [False, True])
+def test_parallel_output_is_identical(tmp_path, monkeypatch, encoding, newline, remove_fillers):
+    """Tests that the segmented parallel merge renders byte-identical output to the sequential path."""
+    vtt = tmp_path / "conference.vtt"
+    write_transcript(vtt, 3000, encoding, newline)
+    monkeypatch.setattr(vtt2md.parallel, "MIN_SEGMENT_BYTES", 1024)
+    assert len(plan_segments(vtt, 8)[1]) == 8
+
+    options = dict(meeting_datetime="2025-01-31 14:30", remove_fillers=remove_fillers, speaker_stats=True)
+    sequential = VttConverter(vtt, str(vtt), **options)
+    parallel = VttConverter(vtt, str(vtt), workers=8, **options)
+
+    assert parallel.to_markdown() == sequential.to_markdown()
+    assert parallel.speakers.names == sequential.speakers.names
+    assert parallel.speakers.turn_counts == sequential.speakers.turn_counts
+    parts = list(VttConverter(vtt, str(vtt), workers=8, **options).iter_markdown_parts(5000))
+    assert parts == list(VttConverter(vtt, str(vtt), **options).iter_markdown_parts(5000))
+
+
+def test_small_or_utf16_files_stay_sequential(tmp_path):
+    """Tests that files too small to split, and UTF-16 files, are not segmented."""
+    vtt = tmp_path / "meeting.vtt"
+    write_transcript(vtt, 200)
+    assert plan_segments(vtt, 8) is None
+    write_transcript(vtt, 200, "utf-16")
+    assert plan_segments(vtt, 8, min_segment_bytes=1024) is None
+
+
+def test_encoding_detected_past_ascii_prefix(tmp_path):
+    """Tests that a CP932 file starting with a long ASCII stretch is split as CP932."""
+    vtt = tmp_path / "meeting.vtt"
+    cue = "00:00:01.000 --> 00:00:02.000\n<v Speaker>Hello</v>\n\n"
+    vtt.write_bytes(("WEBVTT\n\n" + cue * 2000).encode("ascii"))
+    with open(vtt, "ab") as f:
+        f.write("00:00:03.000 --> 00:00:04.000\n<v 遠藤>資料を確認しました。</v>\n".encode("cp932"))
+
+    assert plan_segments(vtt, 2, min_segment_bytes=1024)[0] == "cp932"
+
+
+def test_stitch_across_empty_segment():
+    """Tests that a turn continues across a segment without turns, applying the merge threshold."""
+    def segment(*turns):
+        speakers = SpeakerTable()
+        for turn in turns:
+            speaker_id = speakers.intern(turn.speaker)
+            speakers.turn_counts[speaker_id] += 1
+        return MergedSegments(len(turns), turns[0].start_ms if turns else None,
+                              turns[-1].end_ms if turns else None, list(turns), speakers)
+
+    merged = stitch_segments([segment(Turn("A", 0, 1000, "one")), segment(),
+                              segment(Turn("A", 30_000, 31_000, "two"), Turn("B", 200_000, 201_000, "three"))], 60)
+
+    assert merged.turns == [Turn("A", 0, 31_000, "one two"), Turn("B", 200_000, 201_000, "three")]
+    assert merged.speakers.turn_counts == [1, 1]
+    assert (merged.first_start_ms, merged.last_end_ms) == (0, 201_000)
@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from vtt2md.converter import VttConverter
+from vtt2md.renderers import JsonLinesRenderer, TsvRenderer, get_renderer
+
+VTT = """WEBVTT
+
+1
+00:00:01.000 --> 00:00:03.000
+<v Speaker 1>Hello, this is a test.
+
+2
+00:00:04.000 --> 00:00:06.000
+<v Speaker 2>Tab\there
+and a new line.
+
+3
+00:00:06.500 --> 00:00:08.250
+<v Speaker 2>Back\\slash.
+
+4
+00:00:09.000 --> 00:00:10.000
+<v Speaker 1>Bye.
+"""
+
+
+def test_jsonl_renderer():
+    """Tests that JSON Lines output has one record per merged turn with integer ms offsets."""
+    out = io.StringIO()
+    VttConverter(VTT, "meeting.vtt").write_rendered(out, JsonLinesRenderer())
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [r['speaker'] for r in records] == ["Speaker 1", "Speaker 2", "Speaker 1"]
+    assert records[1]['start_ms'] == 4000 and records[1]['end_ms'] == 8250
+    assert records[0]['text'] == "Hello, this is a test."
+
+
+def test_tsv_renderer_escapes_and_maps_speakers():
+    """Tests the TSV speaker table, turn rows and escaping of tabs, newlines and backslashes."""
+    out = io.StringIO()
+    VttConverter(VTT, "meeting.vtt").write_rendered(out, TsvRenderer())
+    lines = out.getvalue().split('\n')
+
+    assert lines[:6] == ['#speakers', 'id\tname', '0\tSpeaker 1', '1\tSpeaker 2', '#turns',
+                         'speaker_id\tstart_ms\tend_ms\ttext']
+    rows = [line.split('\t') for line in lines[6:] if line]
+    assert all(len(row) == 4 for row in rows)
+    assert rows[1][:3] == ['1', '4000', '8250']
+    assert '\\t' in rows[1][3] and '\\n' in rows[1][3] and '\\\\slash' in rows[1][3]
+    assert rows[2][0] == '0'
+
+
+def test_structured_output_of_empty_transcript_raises():
+    """Tests that structured renderers raise instead of emitting the Markdown error text."""
+    with pytest.raises(ValueError):
+        list(VttConverter("WEBVTT\n", "empty.vtt").iter_rendered(get_renderer('jsonl')))
+    with pytest.raises(ValueError):
+        get_renderer('xml')
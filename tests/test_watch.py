@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+# Add the src directory to the Python path for sibling-module imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import vtt2md.watch
+from vtt2md.watch import FolderWatcher
+
+VTT = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+<v Speaker 1>Hello from the watch folder.
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_watcher(tmp_path, clock):
+    return FolderWatcher(tmp_path / "in", tmp_path / "out", workers=1, settle_seconds=5, clock=clock,
+                         cache_max_bytes=1024 * 1024)
+
+
+def test_files_are_converted_once_settled(tmp_path):
+    """Tests that a file still being written is left alone until its size and mtime settle."""
+    (tmp_path / "in").mkdir()
+    vtt = tmp_path / "in" / "meeting.vtt"
+    vtt.write_text(VTT[:20], encoding="utf-8")
+    clock = FakeClock()
+    watcher = make_watcher(tmp_path, clock)
+
+    assert watcher.scan() == []
+    clock.now = 3
+    vtt.write_text(VTT, encoding="utf-8")
+    assert watcher.scan() == []
+    clock.now = 6
+    assert watcher.scan() == []
+    clock.now = 9
+    watcher.run_once()
+
+    assert "Hello from the watch folder." in (tmp_path / "out" / "meeting.md").read_text(encoding="utf-8")
+    status = json.loads(watcher.status_path.read_text(encoding="utf-8"))
+    assert status['converted'] == 1 and status['pending'] == 0
+    assert status['latency_seconds']['last'] == 9
+
+    clock.now = 20
+    watcher.run_once()
+    assert watcher.counters['converted'] == 1
+
+
+def test_restart_skips_processed_files(tmp_path):
+    """Tests that the conversion cache acts as the processed-file index across restarts."""
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "meeting.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "in" / "broken.vtt").write_text("not a transcript", encoding="utf-8")
+    for _ in range(2):
+        clock = FakeClock()
+        watcher = make_watcher(tmp_path, clock)
+        watcher.scan()
+        clock.now = 10
+        watcher.run_once()
+
+    assert watcher.counters['skipped'] == 1 and watcher.counters['converted'] == 0
+    assert watcher.counters['failed'] == 1 and "broken.vtt" in watcher.last_error
+
+
+def test_same_named_files_in_subfolders_are_refused(tmp_path):
+    """Tests that recursive watching fails files that would share one output, across restarts too."""
+    for folder in ("a", "b"):
+        (tmp_path / "in" / folder).mkdir(parents=True)
+        (tmp_path / "in" / folder / "x.vtt").write_text(VTT, encoding="utf-8")
+    (tmp_path / "in" / "a" / "y.vtt").write_text(VTT, encoding="utf-8")
+    for _ in range(2):
+        clock = FakeClock()
+        watcher = FolderWatcher(tmp_path / "in", tmp_path / "out", recursive=True, settle_seconds=5, clock=clock,
+                                cache_max_bytes=1024 * 1024)
+        watcher.scan()
+        clock.now = 10
+        watcher.run_once()
+        assert watcher.counters['failed'] == 2
+        assert "would also be written by" in watcher.last_error
+
+    assert not (tmp_path / "out" / "x.md").exists()
+    assert (tmp_path / "out" / "y.md").exists()
+
+
+def test_broken_pool_is_replaced(tmp_path, monkeypatch):
+    """Tests that a crashed worker pool is recreated instead of ending the watcher."""
+    pools = []
+    stop_event = threading.Event()
+
+    class FlakyPool:
+        def __init__(self, max_workers):
+            pools.append(self)
+
+        def submit(self, fn, *args):
+            if len(pools) == 1:
+                raise BrokenProcessPool("A child process terminated abruptly")
+            future = Future()
+            future.set_result(fn(*args))
+            stop_event.set()
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(vtt2md.watch, "ProcessPoolExecutor", FlakyPool)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "meeting.vtt").write_text(VTT, encoding="utf-8")
+    clock = FakeClock()
+    watcher = FolderWatcher(tmp_path / "in", tmp_path / "out", workers=2, settle_seconds=5, clock=clock,
+                            cache_max_bytes=1024 * 1024)
+    watcher.scan()
+    clock.now = 10
+
+    watcher.run(stop_event)
+
+    assert len(pools) == 2
+    assert watcher.counters['converted'] == 1
+    assert (tmp_path / "out" / "meeting.md").exists()